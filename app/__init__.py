@@ -16,4 +16,13 @@ def create_app(config_name='default'):
     from .main.routes import main as main_blueprint
     app.register_blueprint(main_blueprint)
 
+    from .lobby import lobby as lobby_blueprint
+    app.register_blueprint(lobby_blueprint)
+
+    # Profiling goes first so its hooks wrap everything else in the request.
+    from . import assets, catalog, profiling
+    profiling.init_app(app)
+    assets.init_app(app)
+    catalog.init_app(app)
+
     return app
\ No newline at end of file
@@ -0,0 +1,195 @@
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+
+from flask import current_app, request, send_from_directory
+
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Images displayed far smaller than their source size are downscaled at build time.
+# The logo is shown at 32px high in the navbar, so 3x covers high-density screens.
+IMAGE_MAX_SIZE = {
+    'images/logo.png': (96, 96),
+}
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.ico', '.json', '.txt'}
+OPTIMIZABLE_IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+_CSS_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def init_app(app):
+    """
+    Resolves url_for('static', ...) through the build manifest and serves fingerprinted
+    files with immutable caching and precompressed variants. Does nothing unless
+    ASSETS_USE_MANIFEST is enabled and `flask build-assets` has produced a manifest.
+    """
+    manifest = {}
+    manifest_path = os.path.join(app.static_folder, DIST_DIR, MANIFEST_NAME)
+    if app.config.get('ASSETS_USE_MANIFEST') and os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    app.extensions['asset_manifest'] = manifest
+    app.extensions['asset_fingerprinted'] = frozenset(manifest.values())
+
+    @app.context_processor
+    def inject_asset_helpers():
+        return {'has_static': lambda filename: filename in manifest}
+
+    if not manifest:
+        return
+
+    @app.url_defaults
+    def fingerprint_static_urls(endpoint, values):
+        if endpoint == 'static' and values.get('filename') in manifest:
+            values['filename'] = manifest[values['filename']]
+
+    app.view_functions['static'] = _serve_static
+
+
+def _serve_static(filename):
+    """
+    Serves a static file, preferring a precompressed variant for fingerprinted build output.
+    Only files listed as manifest values carry a content hash and get immutable caching;
+    everything else, including dist/manifest.json itself, keeps the default caching.
+    """
+    if filename not in current_app.extensions['asset_fingerprinted']:
+        return current_app.send_static_file(filename)
+
+    static_folder = current_app.static_folder
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings.quality(encoding) > 0 and \
+                os.path.isfile(os.path.join(static_folder, filename + suffix)):
+            mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            response = send_from_directory(static_folder, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(static_folder, filename)
+
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def build_assets(static_folder, log=print):
+    """
+    Builds fingerprinted copies of every static file into static/dist/:
+    minified CSS/JS, optimized images plus WebP variants, and .gz/.br siblings for text assets.
+    Writes a manifest mapping original names (e.g. 'css/main.css') to built names
+    (e.g. 'dist/css/main.3f2a9c1b7e.css'). Returns the manifest.
+    """
+    dist_folder = os.path.join(static_folder, DIST_DIR)
+    if os.path.isdir(dist_folder):
+        shutil.rmtree(dist_folder)
+    os.makedirs(dist_folder)
+
+    sources = []
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_folder)
+        for name in sorted(files):
+            rel_path = os.path.relpath(os.path.join(root, name), static_folder).replace(os.sep, '/')
+            sources.append(rel_path)
+
+    # CSS goes last so url() references can point at already fingerprinted files.
+    sources.sort(key=lambda path: posixpath.splitext(path)[1] == '.css')
+
+    manifest = {}
+    for rel_path in sources:
+        with open(os.path.join(static_folder, rel_path), 'rb') as f:
+            content = f.read()
+        ext = posixpath.splitext(rel_path)[1].lower()
+
+        if ext == '.css':
+            content = _minify_css(content.decode('utf-8'), rel_path, manifest).encode('utf-8')
+        elif ext == '.js':
+            import rjsmin
+            content = rjsmin.jsmin(content.decode('utf-8')).encode('utf-8')
+        elif ext in OPTIMIZABLE_IMAGE_EXTENSIONS:
+            content, webp = _optimize_image(content, IMAGE_MAX_SIZE.get(rel_path))
+            webp_path = posixpath.splitext(rel_path)[0] + '.webp'
+            manifest[webp_path] = _write_fingerprinted(dist_folder, webp_path, webp)
+
+        built_path = _write_fingerprinted(dist_folder, rel_path, content)
+        manifest[rel_path] = built_path
+        if ext in COMPRESSIBLE_EXTENSIONS:
+            _write_compressed(os.path.join(static_folder, built_path), content)
+        log(f"  {rel_path} -> {built_path} ({len(content):,} bytes)")
+
+    with open(os.path.join(dist_folder, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def _write_fingerprinted(dist_folder, rel_path, content):
+    """Writes content under a name containing its hash and returns the path relative to the static folder."""
+    stem, ext = posixpath.splitext(rel_path)
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    built_name = f"{stem}.{digest}{ext}"
+    target = os.path.join(dist_folder, *built_name.split('/'))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as f:
+        f.write(content)
+    return f"{DIST_DIR}/{built_name}"
+
+
+def _write_compressed(path, content):
+    """Writes .gz and .br siblings, skipping any that would not be smaller than the original."""
+    import brotli
+    variants = (
+        ('.gz', gzip.compress(content, compresslevel=9, mtime=0)),
+        ('.br', brotli.compress(content, quality=11)),
+    )
+    for suffix, compressed in variants:
+        if len(compressed) < len(content):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+
+
+def _minify_css(css, rel_path, manifest):
+    """Minifies CSS and rewrites relative url() references to their fingerprinted names."""
+    import rcssmin
+    base_dir = posixpath.dirname(rel_path)
+
+    def rewrite(match):
+        url = match.group(2)
+        if url.startswith(('data:', 'http:', 'https:', '//', '/', '#')):
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(base_dir, url))
+        if target not in manifest:
+            return match.group(0)
+        # The built CSS lives in dist/<base_dir>, next to the other built files.
+        relative = posixpath.relpath(manifest[target], posixpath.join(DIST_DIR, base_dir))
+        return f'url("{relative}")'
+
+    return rcssmin.cssmin(_CSS_URL_RE.sub(rewrite, css))
+
+
+def _optimize_image(content, max_size):
+    """Returns (optimized original-format bytes, WebP bytes), downscaling to max_size if given."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(content)) as image:
+        image_format = image.format
+        if max_size:
+            image.thumbnail(max_size, Image.LANCZOS)
+
+        optimized = io.BytesIO()
+        if image_format == 'PNG':
+            image.save(optimized, format='PNG', optimize=True)
+        else:
+            image.save(optimized, format=image_format, optimize=True, quality=85, progressive=True)
+
+        webp = io.BytesIO()
+        image.save(webp, format='WEBP', quality=85, method=6)
+
+    optimized = optimized.getvalue()
+    if not max_size and len(optimized) >= len(content):
+        optimized = content
+    return optimized, webp.getvalue()
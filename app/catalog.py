@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, has_request_context
+
+from . import db
+from .models import Category, CatalogVersion, Value
+
+
+class ValueRecord:
+    """Lightweight, read-only stand-in for a Value row."""
+    __slots__ = ('id', 'value_core', 'description')
+
+    def __init__(self, id, value_core, description):
+        self.id = id
+        self.value_core = value_core
+        self.description = description
+
+    def __repr__(self):
+        return f'<ValueRecord {self.value_core}>'
+
+
+class CategoryRecord:
+    """Lightweight, read-only stand-in for a Category row and its values."""
+    __slots__ = ('id', 'name', 'description', 'display_group', 'values', '_by_core')
+
+    def __init__(self, id, name, description, display_group, values):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.display_group = display_group
+        self.values = tuple(values)
+        self._by_core = {value.value_core: value for value in self.values}
+
+    def find_value(self, value_core):
+        """Returns the ValueRecord with this value_core, or None."""
+        return self._by_core.get(value_core)
+
+    def __repr__(self):
+        return f'<CategoryRecord {self.name} (Group: {self.display_group})>'
+
+
+GROUP_ORDER = (
+    "Body & Exterior", "Engine & Drivetrain", "Chassis & Suspension",
+    "Interior & Features", "Restrictions & Meta", "Other"
+)
+
+
+class CatalogSnapshot:
+    """Immutable, in-memory copy of all categories and values for one catalog generation."""
+
+    def __init__(self, generation, categories):
+        self.generation = generation
+        self.categories = tuple(categories)
+        self._by_name = {category.name: category for category in self.categories}
+
+    def get(self, name):
+        """Returns the CategoryRecord with this name, or None."""
+        return self._by_name.get(name)
+
+    def grouped(self):
+        """Categories grouped by display group, in the order the index page shows them."""
+        groups = OrderedDict((group_name, []) for group_name in GROUP_ORDER)
+        for category in self.categories:
+            groups.setdefault(category.display_group or "Other", []).append(category)
+        return groups
+
+
+class _CatalogState:
+    """Per-application holder of the current snapshot and the last generation check."""
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self.snapshot = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+
+def init_app(app):
+    """Registers the catalog on the app. Requests pin a snapshot on first use (see current_catalog)."""
+    app.extensions['catalog'] = _CatalogState(app.config['CATALOG_CHECK_INTERVAL'])
+
+
+def current_catalog():
+    """
+    Returns the catalog snapshot for the current request, or the latest one outside a request.
+    The first call in a request pins the snapshot in g, so the request keeps it even if a reload
+    swaps in a newer one meanwhile, and requests that never touch the catalog (static files,
+    lobby state, event streams) never check it. If the first load fails, the request gets an empty catalog.
+    """
+    state = current_app.extensions['catalog']
+    if not has_request_context():
+        return _refresh_if_stale(state)
+    if 'catalog' not in g:
+        try:
+            g.catalog = _refresh_if_stale(state)
+        except Exception as e:
+            current_app.logger.error(f"Database error loading the catalog: {e}")
+            g.catalog = CatalogSnapshot(0, [])
+    return g.catalog
+
+
+def load_snapshot(generation=None):
+    """
+    Loads all categories and values into a new snapshot with two column-projection queries,
+    so no ORM objects are created or kept in the identity map.
+    """
+    if generation is None:
+        generation = read_generation()
+
+    values_by_category = {}
+    value_rows = db.session.execute(
+        db.select(Value.category_id, Value.id, Value.value_core, Value.description).order_by(Value.id)
+    )
+    for category_id, value_id, value_core, description in value_rows:
+        values_by_category.setdefault(category_id, []).append(ValueRecord(value_id, value_core, description))
+
+    category_rows = db.session.execute(
+        db.select(Category.id, Category.name, Category.description, Category.display_group)
+        .order_by(Category.display_group, Category.name)
+    )
+    return CatalogSnapshot(generation, [
+        CategoryRecord(category_id, name, description, display_group, values_by_category.get(category_id, ()))
+        for category_id, name, description, display_group in category_rows
+    ])
+
+
+def read_generation():
+    """Reads the published catalog generation (a single-row lookup)."""
+    generation = db.session.execute(
+        db.select(CatalogVersion.generation).where(CatalogVersion.id == 1)
+    ).scalar()
+    return generation or 0
+
+
+def publish_generation():
+    """Bumps the catalog generation so every worker reloads its snapshot on the next check."""
+    version = db.session.get(CatalogVersion, 1)
+    if version is None:
+        version = CatalogVersion(id=1, generation=0)
+        db.session.add(version)
+    version.generation += 1
+    db.session.commit()
+    return version.generation
+
+
+def _refresh_if_stale(state):
+    """
+    Returns the current snapshot, checking the published generation at most once per
+    check_interval seconds. Only one thread reloads; the others keep serving the old
+    snapshot until the new one is fully loaded and swapped in.
+    """
+    snapshot = state.snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - state.checked_at < state.check_interval:
+        return snapshot
+
+    if not state.lock.acquire(blocking=snapshot is None):
+        return snapshot
+    try:
+        if state.snapshot is not snapshot:
+            return state.snapshot
+        try:
+            generation = read_generation()
+            if snapshot is None or generation != snapshot.generation:
+                state.snapshot = load_snapshot(generation)
+                if snapshot is not None:
+                    current_app.logger.info(f"Catalog reloaded: generation {snapshot.generation} -> {generation}.")
+        except Exception as e:
+            db.session.rollback()
+            if snapshot is None:
+                raise
+            current_app.logger.error(f"Catalog generation check failed, keeping the current snapshot: {e}")
+        state.checked_at = now
+        return state.snapshot
+    finally:
+        state.lock.release()
@@ -0,0 +1 @@
+from .routes import lobby
\ No newline at end of file
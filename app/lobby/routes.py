@@ -0,0 +1,245 @@
+import threading
+from datetime import datetime
+
+from flask import Blueprint, Response, abort, current_app, jsonify, render_template, request, url_for
+
+from ..catalog import current_catalog
+from ..models import Template
+from ..utils.config_schema import validate_config
+from ..utils.generator import ChallengeGenerator
+from .store import LobbyUpdateRejected, create_store
+
+lobby = Blueprint('lobby', __name__, url_prefix='/lobby')
+
+
+class _StreamSlots:
+    """Counts open event streams so one process never holds more than LOBBY_MAX_STREAMS of them."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.open = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self.open >= self.limit:
+                return False
+            self.open += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.open -= 1
+
+
+@lobby.record_once
+def _create_store(state):
+    state.app.extensions['lobby_store'] = create_store(state.app)
+    state.app.extensions['lobby_streams'] = _StreamSlots(state.app.config['LOBBY_MAX_STREAMS'])
+
+
+def _store():
+    return current_app.extensions['lobby_store']
+
+
+def _clamp_players(value, default=1):
+    try:
+        return max(1, min(int(value), 10))
+    except (ValueError, TypeError):
+        return default
+
+
+def _generate(config, num_players):
+    """Runs the generator once for the whole lobby. Returns (results, errors)."""
+    generator = ChallengeGenerator(custom_config=config)
+    results, _ = generator.generate(num_players=num_players)
+    return results, generator.errors
+
+
+def _sse(event, data, event_id=None):
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+@lobby.route('', methods=['POST'])
+def create_lobby():
+    """
+    Creates a lobby from a template or a custom config. If 'results' are given (the challenge the host
+    is looking at), they are checked against the config and the catalog and shared as they are;
+    otherwise a first challenge is generated.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify(success=False, errors=["The request body is not a valid JSON object."]), 400
+
+    num_players = _clamp_players(data.get('num_players', 1))
+    template_id = str(data.get('template_id', 'custom'))
+
+    if template_id == 'custom':
+        config, errors, field_errors = validate_config(data.get('config'))
+        if errors:
+            return jsonify(success=False, errors=errors, field_errors=field_errors), 400
+    else:
+        template = Template.query.get(int(template_id)) if template_id.isdigit() else None
+        if not template or not isinstance(template.config, dict):
+            return jsonify(success=False, errors=[f"Template ID {template_id} not found or is corrupted."]), 404
+        config = template.config
+
+    try:
+        if 'results' in data:
+            generator = ChallengeGenerator(custom_config=config)
+            results, errors = generator.validate_results(data['results']), generator.errors
+        else:
+            results, errors = _generate(config, num_players)
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error while creating a lobby: {e}", exc_info=True)
+        return jsonify(success=False, errors=["Internal server error during generation."]), 500
+    if not results:
+        return jsonify(success=False, errors=errors or ["Failed to generate a challenge."]), 400
+
+    new_lobby = _store().create(config, results)
+    return jsonify(success=True, lobby_id=new_lobby.id,
+                   url=url_for('lobby.view_lobby', lobby_id=new_lobby.id)), 201
+
+
+@lobby.route('/<lobby_id>')
+def view_lobby(lobby_id):
+    """Lobby page: shows the shared results and follows them live."""
+    current = _store().get(lobby_id)
+    if current is None:
+        abort(404)
+    return render_template('lobby.html', lobby=current, now=datetime.utcnow)
+
+
+@lobby.route('/<lobby_id>/state')
+def lobby_state(lobby_id):
+    """Current lobby state as JSON."""
+    current = _store().get(lobby_id)
+    if current is None:
+        return jsonify(success=False, error="Lobby not found or expired."), 404
+    return Response(current.payload(), mimetype='application/json')
+
+
+@lobby.route('/<lobby_id>/events')
+def lobby_events(lobby_id):
+    """
+    Server-Sent Events stream: a 'state' event now and after every change, comments as keep-alives,
+    and a 'closed' event when the lobby expires. Every viewer receives the same pre-serialized payload.
+    Each stream stays open for as long as the viewer does, so they are capped per process; above the cap
+    the client gets a 503 and polls /state instead.
+    """
+    store = _store()
+    current = store.get(lobby_id)
+    if current is None:
+        abort(404)
+    keepalive = current_app.config['LOBBY_KEEPALIVE_SECONDS']
+    slots = current_app.extensions['lobby_streams']
+    if not slots.acquire():
+        return jsonify(success=False, error="Too many live viewers; poll the lobby state instead."), 503, \
+            {'Retry-After': str(keepalive)}
+
+    def stream(current):
+        version = current.version
+        yield "retry: 3000\n\n"
+        yield _sse('state', current.payload(), version)
+        while True:
+            current = store.wait_for_update(lobby_id, version, keepalive)
+            if current is None:
+                yield _sse('closed', '{}')
+                return
+            if current.version == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = current.version
+            yield _sse('state', current.payload(), version)
+
+    response = Response(stream(current), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # call_on_close also runs when the stream is closed before its first chunk.
+    response.call_on_close(slots.release)
+    return response
+
+
+@lobby.route('/<lobby_id>/reroll', methods=['POST'])
+def reroll(lobby_id):
+    """Rerolls one category for one player, or once for all players, and pushes it to every viewer."""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not data.get('category_name'):
+        return jsonify(success=False, error="Invalid request data."), 400
+
+    store = _store()
+    current = store.get(lobby_id)
+    if current is None:
+        return jsonify(success=False, error="Lobby not found or expired."), 404
+
+    category_name = data['category_name']
+    rules = current.config.get(category_name)
+    if not isinstance(rules, dict):
+        return jsonify(success=False, error=f"Category '{category_name}' is not part of this lobby."), 400
+
+    player_index = data.get('player_index')
+    if player_index is not None:
+        if not isinstance(player_index, int) or not (0 <= player_index < current.num_players):
+            return jsonify(success=False, error="Invalid player index."), 400
+        if rules.get('apply_all'):
+            return jsonify(success=False, error=f"'{category_name}' is shared by all players."), 400
+
+    category = current_catalog().get(category_name)
+    if category is None:
+        return jsonify(success=False, error=f"Category '{category_name}' not found."), 404
+
+    try:
+        generator = ChallengeGenerator()
+        new_values = generator.reroll_category(category, rules)
+    except Exception as e:
+        current_app.logger.error(f"Error during lobby reroll for '{category_name}': {e}", exc_info=True)
+        return jsonify(success=False, error="Internal server error."), 500
+    if new_values is None:
+        error_message = "; ".join(generator.errors) or f"Failed to reroll '{category_name}'."
+        return jsonify(success=False, error=error_message), 500
+
+    def apply(lobby_to_update):
+        # Checked again under the store lock: a regenerate may have changed the lobby since the check above.
+        if player_index is not None and player_index >= lobby_to_update.num_players:
+            raise LobbyUpdateRejected("Invalid player index.")
+        targets = range(lobby_to_update.num_players) if player_index is None else [player_index]
+        for i in targets:
+            lobby_to_update.results[i][category_name] = new_values
+
+    try:
+        updated = store.update(lobby_id, apply)
+    except LobbyUpdateRejected as e:
+        return jsonify(success=False, error=str(e)), 400
+    if updated is None:
+        return jsonify(success=False, error="Lobby not found or expired."), 404
+    return jsonify(success=True, version=updated.version)
+
+
+@lobby.route('/<lobby_id>/regenerate', methods=['POST'])
+def regenerate(lobby_id):
+    """Generates a fresh challenge from the lobby's config and pushes it to every viewer."""
+    data = request.get_json(silent=True) or {}
+    store = _store()
+    current = store.get(lobby_id)
+    if current is None:
+        return jsonify(success=False, errors=["Lobby not found or expired."]), 404
+
+    num_players = _clamp_players(data.get('num_players', current.num_players), current.num_players)
+    try:
+        results, errors = _generate(current.config, num_players)
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error while regenerating lobby {lobby_id}: {e}", exc_info=True)
+        return jsonify(success=False, errors=["Internal server error during generation."]), 500
+    if not results:
+        return jsonify(success=False, errors=errors or ["Failed to generate a challenge."]), 400
+
+    def apply(lobby_to_update):
+        lobby_to_update.results = results
+
+    updated = store.update(lobby_id, apply)
+    if updated is None:
+        return jsonify(success=False, errors=["Lobby not found or expired."]), 404
+    return jsonify(success=True, version=updated.version)
@@ -0,0 +1,168 @@
+import json
+import secrets
+import threading
+import time
+
+from werkzeug.utils import import_string
+
+
+class Lobby:
+    """
+    One shared challenge: the config it was generated from and the current results for every player.
+    A published Lobby is never modified; updates replace it with a new version.
+    """
+
+    def __init__(self, lobby_id, config, results, version=1):
+        self.id = lobby_id
+        self.config = config
+        self.results = results
+        self.version = version
+        self.touched_at = time.monotonic()
+        self._payload = None
+
+    def copy(self):
+        """Copy with per-player result dicts of its own, so an update never touches a published lobby."""
+        lobby = Lobby(self.id, self.config, [dict(player) for player in self.results], self.version)
+        lobby.touched_at = self.touched_at
+        return lobby
+
+    @property
+    def num_players(self):
+        return len(self.results)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'version': self.version,
+            'config': self.config,
+            'results': self.results,
+        }
+
+    def payload(self):
+        """JSON state, serialized once per version (under the store lock) and shared by every viewer."""
+        if self._payload is None:
+            self._payload = json.dumps(self.to_dict(), ensure_ascii=False)
+        return self._payload
+
+
+class LobbyUpdateRejected(ValueError):
+    """Raised by an update's mutate function to abort it; nothing is published."""
+    pass
+
+
+class LobbyStore:
+    """
+    Interface for lobby storage backends.
+    A backend must make `update` visible to every `wait_for_update` caller on the same lobby,
+    across all the processes that serve lobby requests.
+    """
+
+    def create(self, config, results):
+        raise NotImplementedError
+
+    def get(self, lobby_id):
+        raise NotImplementedError
+
+    def update(self, lobby_id, mutate):
+        """
+        Applies mutate(lobby) to a copy and publishes it as the new version. Returns the lobby, or None if it is gone.
+        If mutate raises (e.g. LobbyUpdateRejected), the exception propagates and the current version stays published.
+        """
+        raise NotImplementedError
+
+    def wait_for_update(self, lobby_id, seen_version, timeout):
+        """
+        Blocks until the lobby's version differs from seen_version or the timeout passes.
+        Returns the lobby (unchanged on timeout), or None if it no longer exists.
+        """
+        raise NotImplementedError
+
+
+class MemoryLobbyStore(LobbyStore):
+    """
+    In-process lobby storage with TTL eviction. All lobbies share one lock, and each lobby has
+    its own condition, so an update wakes only that lobby's viewers. State is not shared between
+    processes: run a single (threaded) worker, or plug in a shared backend.
+    """
+
+    def __init__(self, ttl=6 * 3600, max_lobbies=10000):
+        self.ttl = ttl
+        self.max_lobbies = max_lobbies
+        self._lock = threading.Lock()
+        self._lobbies = {}
+        self._conditions = {}
+
+    def create(self, config, results):
+        with self._lock:
+            self._evict_expired()
+            if len(self._lobbies) >= self.max_lobbies:
+                oldest_id = min(self._lobbies, key=lambda lobby_id: self._lobbies[lobby_id].touched_at)
+                self._remove(oldest_id)
+            lobby_id = secrets.token_urlsafe(6)
+            while lobby_id in self._lobbies:
+                lobby_id = secrets.token_urlsafe(6)
+            lobby = Lobby(lobby_id, config, results)
+            lobby.payload()
+            self._lobbies[lobby_id] = lobby
+            self._conditions[lobby_id] = threading.Condition(self._lock)
+            return lobby
+
+    def get(self, lobby_id):
+        with self._lock:
+            return self._get_live(lobby_id)
+
+    def update(self, lobby_id, mutate):
+        with self._lock:
+            current = self._get_live(lobby_id)
+            if current is None:
+                return None
+            lobby = current.copy()
+            mutate(lobby)
+            lobby.version = current.version + 1
+            lobby.payload()
+            self._lobbies[lobby_id] = lobby
+            self._conditions[lobby_id].notify_all()
+            return lobby
+
+    def wait_for_update(self, lobby_id, seen_version, timeout):
+        with self._lock:
+            lobby = self._get_live(lobby_id)
+            if lobby is None or lobby.version != seen_version:
+                return lobby
+            self._conditions[lobby_id].wait(timeout)
+            return self._lobbies.get(lobby_id)
+
+    def _get_live(self, lobby_id):
+        """Returns a lobby that has not expired, refreshing its TTL; viewers keep a lobby alive."""
+        lobby = self._lobbies.get(lobby_id)
+        if lobby is None:
+            return None
+        now = time.monotonic()
+        if now - lobby.touched_at > self.ttl:
+            self._remove(lobby_id)
+            return None
+        lobby.touched_at = now
+        return lobby
+
+    def _remove(self, lobby_id):
+        self._lobbies.pop(lobby_id, None)
+        condition = self._conditions.pop(lobby_id, None)
+        if condition is not None:
+            condition.notify_all()
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for lobby_id in [i for i, lobby in self._lobbies.items() if now - lobby.touched_at > self.ttl]:
+            self._remove(lobby_id)
+
+
+LOBBY_BACKENDS = {
+    'memory': MemoryLobbyStore,
+}
+
+
+def create_store(app):
+    """Builds the backend named by LOBBY_STORE: a key of LOBBY_BACKENDS or a dotted import path."""
+    backend = app.config['LOBBY_STORE']
+    store_class = LOBBY_BACKENDS.get(backend) or import_string(backend)
+    return store_class(ttl=app.config['LOBBY_TTL'], max_lobbies=app.config['LOBBY_MAX_COUNT'])
@@ -4,12 +4,21 @@ from datetime import datetime
 from flask import Blueprint, render_template, current_app, request, jsonify, flash
 
 from .. import db
-from ..models import Template, Category
+from ..catalog import current_catalog
+from ..models import Template
+from ..utils.analyzer import AnalysisCache, TemplateAnalyzer
+from ..utils.config_schema import validate_config
 from ..utils.generator import ChallengeGenerator
+from ..utils.template_search import search_templates
 
 main = Blueprint('main', __name__)
 
 
+@main.record_once
+def _create_stats_cache(state):
+    state.app.extensions['template_stats_cache'] = AnalysisCache(state.app.config['ANALYZER_CACHE_SIZE'])
+
+
 def _build_custom_config_from_form(form_data):
     """Builds a configuration dictionary from the form data."""
     custom_config = {}
@@ -79,48 +88,54 @@ def _build_custom_config_from_form(form_data):
 
 @main.route('/')
 def index():
-    """Main page route."""
+    """Main page route. The template picker shows one keyset-paginated page of search_templates results."""
     templates = []
+    next_before = None
+    template_search = request.args.get('q', '').strip()
+    before = request.args.get('before', type=int)
     grouped_categories = OrderedDict()
-    group_order = [
-        "Body & Exterior", "Engine & Drivetrain", "Chassis & Suspension",
-        "Interior & Features", "Restrictions & Meta", "Other"
-    ]
 
     try:
-        templates = Template.query.order_by(Template.name).all()
-        all_categories_from_db = Category.query.options(
-            db.joinedload(Category.values)
-        ).order_by(Category.display_group, Category.name).all()
-
-        for group_name in group_order:
-            grouped_categories[group_name] = []
-        for category in all_categories_from_db:
-            group_name = category.display_group if category.display_group else "Other"
-            if group_name not in grouped_categories:
-                grouped_categories[group_name] = []
-            grouped_categories[group_name].append(category)
-
+        templates, next_before = search_templates(template_search, before=before,
+                                                  limit=current_app.config['TEMPLATES_PER_PAGE'])
+        grouped_categories = current_catalog().grouped()
     except Exception as e:
         current_app.logger.error(f"Database error fetching data for index: {e}")
         flash('Error loading data from the database.', 'error')
 
     return render_template('index.html',
                            templates=templates,
+                           template_search=template_search,
+                           templates_before=before,
+                           templates_next_before=next_before,
                            grouped_categories=grouped_categories,
                            now=datetime.utcnow)
 
 
 @main.route('/generate', methods=['POST'])
 def generate_challenge():
-    """AJAX endpoint for generation. Returns JSON."""
+    """
+    AJAX endpoint for generation. Returns JSON.
+    Accepts a JSON body {"template_id", "num_players", "config"} or, as a fallback, the generation form.
+    """
     generation_errors = []
-    selected_template_id = request.form.get('template_id')
-    form_data = request.form
+    field_errors = {}
     final_config_used = {}
 
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify(success=False, errors=["The request body is not a valid JSON object."]), 400
+        selected_template_id = payload.get('template_id', 'custom')
+        selected_template_id = str(selected_template_id) if selected_template_id is not None else None
+        num_players_raw = payload.get('num_players', 1)
+    else:
+        payload = None
+        selected_template_id = request.form.get('template_id')
+        num_players_raw = request.form.get('num_players', '1')
+
     try:
-        num_players = int(request.form.get('num_players', '1'))
+        num_players = int(num_players_raw)
         if not (1 <= num_players <= 10):
             num_players = max(1, min(num_players, 10))
     except (ValueError, TypeError):
@@ -128,7 +143,10 @@ def generate_challenge():
 
     try:
         if selected_template_id == 'custom':
-            custom_config, parsing_errors = _build_custom_config_from_form(form_data)
+            if payload is not None:
+                custom_config, parsing_errors, field_errors = validate_config(payload.get('config'))
+            else:
+                custom_config, parsing_errors = _build_custom_config_from_form(request.form)
             generation_errors.extend(parsing_errors)
             if custom_config:
                 final_config_used = custom_config
@@ -161,7 +179,7 @@ def generate_challenge():
         generation_errors.append("Internal server error during generation.")
 
     unique_errors = list(OrderedDict.fromkeys(e for e in generation_errors if e))
-    return jsonify(success=False, errors=unique_errors), 400
+    return jsonify(success=False, errors=unique_errors, field_errors=field_errors), 400
 
 
 @main.route("/reroll_category", methods=["POST"])
@@ -174,8 +192,14 @@ def reroll_category():
     category_name, rules = data.get("category_name"), data.get("rules")
     reroll_type = data.get("reroll_type", "single")
 
+    checked_config, config_errors, _ = validate_config({category_name: rules}) if isinstance(category_name, str) \
+        else (None, ["Invalid category name."], {})
+    if config_errors:
+        return jsonify(success=False, error=" ".join(config_errors)), 400
+    rules = checked_config[category_name]
+
     try:
-        category = Category.query.filter_by(name=category_name).first()
+        category = current_catalog().get(category_name)
         if not category:
             return jsonify(success=False, error=f"Category '{category_name}' not found."), 404
 
@@ -187,12 +211,63 @@ def reroll_category():
             error_message = "; ".join(generator.errors) or f"Failed to reroll '{category_name}'."
             return jsonify(success=False, error=error_message), 500
 
-        return jsonify(success=True, new_values=new_values)
+        return jsonify(success=True, new_values=new_values, rules=rules)
     except Exception as e:
         current_app.logger.error(f"Error during reroll for '{category_name}': {e}", exc_info=True)
         return jsonify(success=False, error="Internal server error."), 500
 
 
+@main.route('/api/templates/search')
+def template_search():
+    """Type-ahead search over template names and descriptions, newest first, keyset-paginated."""
+    limit = request.args.get('limit', 20, type=int)
+    limit = max(1, min(limit, current_app.config['TEMPLATE_SEARCH_MAX_LIMIT']))
+    before = request.args.get('before', type=int)
+
+    try:
+        items, next_before = search_templates(request.args.get('q', ''), before=before, limit=limit)
+    except Exception as e:
+        current_app.logger.error(f"Error searching templates: {e}", exc_info=True)
+        return jsonify(success=False, error="Error searching templates."), 500
+
+    return jsonify(success=True, items=items, next_before=next_before)
+
+
+@main.route('/api/templates/<int:template_id>/stats')
+def template_stats(template_id):
+    """
+    Returns the challenge space size and simulated outcome frequencies of a template.
+    Draws are capped well below the CLI's, and results are cached per config, catalog generation and parameters.
+    """
+    max_draws = current_app.config['ANALYZER_MAX_DRAWS']
+    draws = request.args.get('draws', current_app.config['ANALYZER_DEFAULT_DRAWS'], type=int)
+    num_players = request.args.get('num_players', 1, type=int)
+    seed = request.args.get('seed', type=int)
+    draws = max(1, min(draws, max_draws))
+    num_players = max(1, min(num_players, 10))
+
+    analyzer = TemplateAnalyzer(template_id=template_id, seed=seed)
+    if analyzer.errors or analyzer.template is None:
+        return jsonify(success=False, errors=analyzer.errors or [f"Template with ID {template_id} not found."]), 404
+
+    cache = current_app.extensions['template_stats_cache']
+    cache_key = (template_id, analyzer.template.config_hash, analyzer.catalog.generation, draws, num_players, seed)
+    stats = cache.get(cache_key)
+    if stats is not None:
+        return jsonify(success=True, stats=stats, cached=True)
+
+    try:
+        stats = analyzer.analyze(draws=draws, num_players=num_players)
+    except Exception as e:
+        current_app.logger.error(f"Error analyzing template {template_id}: {e}", exc_info=True)
+        return jsonify(success=False, errors=["Internal server error during analysis."]), 500
+
+    if stats is None:
+        return jsonify(success=False, errors=analyzer.errors), 400
+    cache.set(cache_key, stats)
+    return jsonify(success=True, stats=stats, cached=False)
+
+
 @main.route('/about')
 def about():
     """About page route."""
@@ -208,10 +283,18 @@ def save_template():
 
     name = data['name'].strip()
     description = data.get('description', '').strip()
-    config = data['config']
+    config, config_errors, _ = validate_config(data['config'])
 
     if not name:
         return jsonify(success=False, error="Template name cannot be empty."), 400
+    if config_errors:
+        return jsonify(success=False, error=" ".join(config_errors)), 400
+
+    existing_template = Template.find_by_config(config)
+    if existing_template:
+        return jsonify(success=True, existing=True,
+                       message=f"An identical template is already saved as '{existing_template.name}'.",
+                       new_template={'id': existing_template.id, 'name': existing_template.name})
 
     if Template.query.filter_by(name=name).first():
         return jsonify(success=False, error=f"A template with the name '{name}' already exists."), 409
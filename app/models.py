@@ -1,10 +1,13 @@
 from . import db
+import hashlib
 import json
+from datetime import datetime
 
 class Category(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(80), unique=True, nullable=False)
-    values = db.relationship('Value', backref='category', lazy='joined', cascade="all, delete-orphan")
+    # Loaded on access only; call sites that need values for many categories use selectinload.
+    values = db.relationship('Value', backref='category', lazy='select', cascade="all, delete-orphan")
     description = db.Column(db.String(200))
     display_group = db.Column(db.String(100), nullable=True, index=True)
 
@@ -20,15 +23,40 @@ class Value(db.Model):
     def __repr__(self):
         return f'<Value {self.value_core} (Category: {self.category.name})>'
 
+class CatalogVersion(db.Model):
+    """Single row (id=1) holding the catalog generation; bumped whenever categories or values change."""
+    id = db.Column(db.Integer, primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CatalogVersion {self.generation}>'
+
 class Template(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
     description = db.Column(db.String(250))
     config_json = db.Column(db.Text, nullable=False)
+    config_hash = db.Column(db.String(64), nullable=False, index=True)
 
     def __repr__(self):
         return f'<Template {self.name}>'
 
+    @staticmethod
+    def canonical_config_json(value):
+        """Serializes a config as compact JSON with sorted keys, so equal configs give equal strings."""
+        return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+    @staticmethod
+    def hash_config_json(config_json):
+        return hashlib.sha256(config_json.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def find_by_config(cls, value):
+        """Returns an existing template with exactly this config, or None."""
+        config_hash = cls.hash_config_json(cls.canonical_config_json(value))
+        return cls.query.filter_by(config_hash=config_hash).order_by(cls.id).first()
+
     @property
     def config(self):
         try:
@@ -38,4 +66,5 @@ class Template(db.Model):
 
     @config.setter
     def config(self, value):
-        self.config_json = json.dumps(value, ensure_ascii=False, indent=2)
\ No newline at end of file
+        self.config_json = self.canonical_config_json(value)
+        self.config_hash = self.hash_config_json(self.config_json)
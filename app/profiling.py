@@ -0,0 +1,248 @@
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import (Blueprint, abort, current_app, flash, g, redirect, render_template, request,
+                   send_from_directory, session, url_for)
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_QUERY_ARG = '_profile'
+SPEEDSCOPE_SUFFIX = '.speedscope.json'
+COLLAPSED_SUFFIX = '.collapsed.txt'
+SESSION_KEY = 'profiling_admin'
+SESSION_MAX_AGE = 8 * 3600
+
+profiling = Blueprint('profiling', __name__, url_prefix='/_profiles')
+
+
+def init_app(app):
+    """
+    Enables per-request profiling when PROFILING_ENABLED is set and a PROFILING_TOKEN is configured.
+    Otherwise no hooks are registered at all, so ordinary requests pay nothing.
+    """
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+    if not app.config.get('PROFILING_TOKEN'):
+        app.logger.warning("PROFILING_ENABLED is set but PROFILING_TOKEN is empty; profiling stays off.")
+        return
+
+    os.makedirs(app.config['PROFILE_DIR'], exist_ok=True)
+    app.register_blueprint(profiling)
+
+    @app.before_request
+    def start_profiler():
+        if request.blueprint == profiling.name:
+            return
+        token = request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_ARG)
+        if token and _is_admin_token(token):
+            g.profiler = _Sampler(threading.get_ident(), app.config['PROFILING_INTERVAL'])
+            g.profiler.start()
+
+    @app.after_request
+    def stop_profiler(response):
+        filename = _finish_profile(response.status_code)
+        if filename:
+            response.headers['X-Profile-File'] = filename
+        return response
+
+    @app.teardown_request
+    def stop_profiler_on_error(exc):
+        _finish_profile(500)
+
+
+def _is_admin_token(token):
+    return hmac.compare_digest(token.encode('utf-8'), current_app.config['PROFILING_TOKEN'].encode('utf-8'))
+
+
+def _token_fingerprint():
+    """Ties a profiling session to the current token, so changing PROFILING_TOKEN signs everyone out."""
+    return hashlib.sha256(current_app.config['PROFILING_TOKEN'].encode('utf-8')).hexdigest()[:16]
+
+
+def _has_admin_session():
+    grant = session.get(SESSION_KEY)
+    return isinstance(grant, dict) and grant.get('token') == _token_fingerprint() \
+        and time.time() - grant.get('at', 0) < SESSION_MAX_AGE
+
+
+@profiling.before_request
+def _require_admin():
+    """
+    The profile pages accept the token in the X-Profile header (scripts) or a signed session set once
+    from the sign-in form (browsers). It is never accepted in, or added to, a URL, so it stays out of
+    access logs, browser history and Referer headers.
+    """
+    if request.endpoint == 'profiling.sign_in':
+        return
+    token = request.headers.get(PROFILE_HEADER)
+    if token and _is_admin_token(token):
+        return
+    if _has_admin_session():
+        return
+    if request.endpoint == 'profiling.list_profiles':
+        return render_template('profiles.html', profiles=None, now=datetime.utcnow)
+    abort(404)
+
+
+@profiling.route('/sign-in', methods=['POST'])
+def sign_in():
+    """Checks the token from the sign-in form and grants a browser session."""
+    token = request.form.get('token', '')
+    if token and _is_admin_token(token):
+        session[SESSION_KEY] = {'token': _token_fingerprint(), 'at': time.time()}
+    else:
+        flash('Invalid profiling token.', 'error')
+    return redirect(url_for('profiling.list_profiles'))
+
+
+@profiling.route('/sign-out', methods=['POST'])
+def sign_out():
+    session.pop(SESSION_KEY, None)
+    return redirect(url_for('profiling.list_profiles'))
+
+
+class _Sampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval and counts identical stacks."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.started_at = time.perf_counter()
+        self.duration = 0.0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own_frame_files = {__file__, threading.__file__}
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename not in own_frame_files:
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.duration = time.perf_counter() - self.started_at
+
+
+def _finish_profile(status_code):
+    """Stops the request's sampler, if any, and writes its output. Returns the base file name or None."""
+    sampler = g.pop('profiler', None)
+    if sampler is None:
+        return None
+    sampler.stop()
+
+    try:
+        profile_dir = current_app.config['PROFILE_DIR']
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'index'
+        base_name = (f"{datetime.utcnow():%Y%m%d-%H%M%S-%f}-{request.method}-{slug[:60]}"
+                     f"-{status_code}-{sampler.duration * 1000:.0f}ms")
+        _write_speedscope(os.path.join(profile_dir, base_name + SPEEDSCOPE_SUFFIX), base_name, sampler)
+        _write_collapsed(os.path.join(profile_dir, base_name + COLLAPSED_SUFFIX), sampler)
+        _prune(profile_dir, current_app.config['PROFILING_MAX_FILES'])
+        return base_name
+    except OSError as e:
+        current_app.logger.error(f"Could not write request profile: {e}")
+        return None
+
+
+def _short_filename(filename):
+    """Strips the longest sys.path prefix, so frames read 'app/utils/generator.py' or 'flask/app.py'."""
+    for prefix in sorted((p for p in sys.path if p), key=len, reverse=True):
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def _frame_label(name, filename, line):
+    return f"{name} ({_short_filename(filename)}:{line})"
+
+
+def _write_collapsed(path, sampler):
+    """Brendan Gregg's collapsed-stack format, readable by flamegraph.pl and speedscope."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in sampler.stacks.most_common():
+            f.write(';'.join(_frame_label(*frame).replace(';', ':') for frame in stack) + f" {count}\n")
+
+
+def _write_speedscope(path, name, sampler):
+    """Speedscope's sampled-profile JSON format, with sample weights in seconds."""
+    frames, frame_index, samples, weights = [], {}, [], []
+    for stack, count in sampler.stacks.items():
+        indices = []
+        for frame in stack:
+            if frame not in frame_index:
+                frame_index[frame] = len(frames)
+                frames.append({'name': frame[0], 'file': _short_filename(frame[1]), 'line': frame[2]})
+            indices.append(frame_index[frame])
+        samples.append(indices)
+        weights.append(count * sampler.interval)
+
+    document = {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'name': name,
+        'exporter': 'automation-challenge-profiler',
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled',
+            'name': name,
+            'unit': 'seconds',
+            'startValue': 0,
+            'endValue': sampler.duration,
+            'samples': samples,
+            'weights': weights,
+        }],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f)
+
+
+def _prune(profile_dir, max_profiles):
+    """Keeps only the newest max_profiles profiles (both files of each)."""
+    names = sorted(n[:-len(SPEEDSCOPE_SUFFIX)] for n in os.listdir(profile_dir) if n.endswith(SPEEDSCOPE_SUFFIX))
+    for base_name in names[:-max_profiles] if len(names) > max_profiles else []:
+        for suffix in (SPEEDSCOPE_SUFFIX, COLLAPSED_SUFFIX):
+            try:
+                os.remove(os.path.join(profile_dir, base_name + suffix))
+            except FileNotFoundError:
+                pass
+
+
+@profiling.route('/')
+def list_profiles():
+    """Lists recent request profiles, newest first."""
+    profile_dir = current_app.config['PROFILE_DIR']
+    profiles = []
+    for filename in sorted(os.listdir(profile_dir), reverse=True):
+        if not filename.endswith(SPEEDSCOPE_SUFFIX):
+            continue
+        base_name = filename[:-len(SPEEDSCOPE_SUFFIX)]
+        profiles.append({
+            'name': base_name,
+            'size': os.path.getsize(os.path.join(profile_dir, filename)),
+            'speedscope_url': url_for('profiling.download_profile', filename=filename),
+            'collapsed_url': url_for('profiling.download_profile', filename=base_name + COLLAPSED_SUFFIX),
+        })
+    return render_template('profiles.html', profiles=profiles, now=datetime.utcnow)
+
+
+@profiling.route('/<path:filename>')
+def download_profile(filename):
+    """Downloads one profile file."""
+    if not filename.endswith((SPEEDSCOPE_SUFFIX, COLLAPSED_SUFFIX)):
+        abort(404)
+    return send_from_directory(current_app.config['PROFILE_DIR'], filename, as_attachment=True)
@@ -0,0 +1,210 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const lobbyElement = document.getElementById('lobby');
+    if (!lobbyElement) return;
+
+    const { eventsUrl, stateUrl, rerollUrl, regenerateUrl } = lobbyElement.dataset;
+    const pollInterval = (parseInt(lobbyElement.dataset.pollSeconds, 10) || 15) * 1000;
+    const resultsArea = document.getElementById('results-area');
+    const statusBadge = document.getElementById('lobby-status');
+    const playerCardTemplate = document.getElementById('player-card-template');
+    const categoryItemTemplate = document.getElementById('category-item-template');
+
+    // --- STATE ---
+    let lobbyState = null;
+    let descriptionsVisible = false;
+
+    // --- LIVE UPDATES ---
+    let expired = false;
+    let pollTimer = null;
+    const events = new EventSource(eventsUrl);
+    events.addEventListener('state', (e) => {
+        applyState(JSON.parse(e.data));
+        setStatus('Live', 'success');
+    });
+    events.addEventListener('closed', () => {
+        events.close();
+        markExpired();
+    });
+    events.addEventListener('error', () => {
+        if (events.readyState !== EventSource.CLOSED) {
+            setStatus('Reconnecting...', 'warning');
+        } else if (!expired && pollTimer === null) {
+            // The server refused the stream (e.g. too many viewers): fall back to polling.
+            pollState();
+        }
+    });
+
+    function applyState(state) {
+        if (lobbyState && state.version <= lobbyState.version) return;
+        const previous = lobbyState;
+        lobbyState = state;
+        renderLobby(previous);
+    }
+
+    function markExpired() {
+        expired = true;
+        clearTimeout(pollTimer);
+        setStatus('Lobby expired', 'danger');
+    }
+
+    async function pollState() {
+        try {
+            const response = await fetch(stateUrl, { headers: { 'Accept': 'application/json' } });
+            if (response.status === 404) {
+                markExpired();
+                return;
+            }
+            if (response.ok) {
+                applyState(await response.json());
+                setStatus('Polling', 'info');
+            }
+        } catch (error) {
+            console.error('Lobby poll failed:', error);
+            setStatus('Reconnecting...', 'warning');
+        }
+        pollTimer = setTimeout(pollState, pollInterval);
+    }
+
+    // --- EVENT LISTENERS ---
+    lobbyElement.addEventListener('click', (e) => {
+        const button = e.target.closest('button');
+        if (!button) return;
+
+        if (button.id === 'regenerate-lobby') postAction(button, regenerateUrl, {});
+        if (button.id === 'copy-lobby-link') copyLobbyLink(button);
+        if (button.id === 'toggle-all-descriptions') toggleAllDescriptions(button);
+        if (button.classList.contains('reroll-button')) {
+            postAction(button, rerollUrl, {
+                category_name: button.dataset.categoryName,
+                player_index: parseInt(button.dataset.playerIndex, 10)
+            });
+        }
+        if (button.classList.contains('reroll-all-button')) {
+            postAction(button, rerollUrl, { category_name: button.dataset.categoryName });
+        }
+    });
+
+    /**
+     * Sends a lobby action. The new state arrives for everyone, including us, via the event stream
+     * (or, when polling, on an immediate poll).
+     * @param {HTMLElement} button - The button that triggered the action.
+     * @param {string} url - Action endpoint.
+     * @param {Object} body - JSON body.
+     */
+    async function postAction(button, url, body) {
+        button.disabled = true;
+        const originalIcon = button.innerHTML;
+        button.innerHTML = '<span class="spinner-border spinner-border-sm"></span>';
+
+        try {
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+                body: JSON.stringify(body)
+            });
+            const data = await response.json();
+            if (!response.ok || !data.success) {
+                throw new Error(data.error || (data.errors || []).join(' ') || 'Server error.');
+            }
+            if (pollTimer !== null) {
+                clearTimeout(pollTimer);
+                pollState();
+            }
+        } catch (error) {
+            console.error('Lobby action failed:', error);
+            alert(`Error: ${error.message}`);
+        } finally {
+            button.disabled = false;
+            button.innerHTML = originalIcon;
+        }
+    }
+
+    /**
+     * Renders every player card, highlighting categories that changed since the previous state.
+     * @param {Object|null} previous - The state rendered before this one.
+     */
+    function renderLobby(previous) {
+        resultsArea.innerHTML = '';
+        const { results, config } = lobbyState;
+
+        let colClass = 'col-lg-3 col-md-4 col-sm-6';
+        if (results.length === 1) colClass = 'col-lg-12';
+        else if (results.length === 2) colClass = 'col-lg-6 col-md-6';
+        else if (results.length === 3) colClass = 'col-lg-4 col-md-6';
+
+        results.forEach((playerResult, playerIndex) => {
+            const cardClone = playerCardTemplate.content.cloneNode(true);
+            const playerCard = cardClone.querySelector('.player-card');
+            playerCard.classList.add(...colClass.split(' '));
+            playerCard.querySelector('.player-number').textContent = playerIndex + 1;
+            const categoriesList = playerCard.querySelector('.categories-list');
+
+            for (const [categoryName, itemsList] of Object.entries(playerResult)) {
+                const categoryClone = categoryItemTemplate.content.cloneNode(true);
+                const categoryItem = categoryClone.querySelector('.result-category');
+                categoryItem.querySelector('.category-name').textContent = `${categoryName}:`;
+
+                const rerollButton = categoryItem.querySelector('.reroll-button');
+                const rerollAllButton = categoryItem.querySelector('.reroll-all-button');
+                rerollAllButton.dataset.categoryName = categoryName;
+                if (config[categoryName] && !config[categoryName].apply_all) {
+                    rerollButton.classList.remove('d-none');
+                    rerollButton.dataset.categoryName = categoryName;
+                    rerollButton.dataset.playerIndex = playerIndex;
+                }
+
+                const valuesUl = categoryItem.querySelector('.category-values-list');
+                itemsList.forEach(item => {
+                    const li = document.createElement('li');
+                    li.classList.add('result-item');
+                    const valueSpan = document.createElement('span');
+                    valueSpan.textContent = item.value;
+                    li.appendChild(valueSpan);
+                    if (item.description) {
+                        const descriptionSpan = document.createElement('span');
+                        descriptionSpan.className = 'value-description text-muted fst-italic ms-1 toggleable-description';
+                        descriptionSpan.style.display = descriptionsVisible ? 'inline' : 'none';
+                        descriptionSpan.textContent = ` - ${item.description}`;
+                        li.appendChild(descriptionSpan);
+                    }
+                    valuesUl.appendChild(li);
+                });
+
+                const previousItems = previous && previous.results[playerIndex] && previous.results[playerIndex][categoryName];
+                if (previous && JSON.stringify(previousItems) !== JSON.stringify(itemsList)) {
+                    valuesUl.classList.add('new-item-highlight');
+                    setTimeout(() => { valuesUl.classList.remove('new-item-highlight'); }, 2000);
+                }
+                categoriesList.appendChild(categoryClone);
+            }
+            resultsArea.appendChild(cardClone);
+        });
+    }
+
+    // --- UI HELPER FUNCTIONS ---
+
+    function setStatus(text, color) {
+        statusBadge.textContent = text;
+        statusBadge.className = `badge text-bg-${color} me-2`;
+    }
+
+    function toggleAllDescriptions(button) {
+        descriptionsVisible = !descriptionsVisible;
+        button.innerHTML = descriptionsVisible
+            ? '<i class="bi bi-eye"></i> Hide Descriptions'
+            : '<i class="bi bi-eye-slash"></i> Show Descriptions';
+        resultsArea.querySelectorAll('.toggleable-description')
+            .forEach(span => span.style.display = descriptionsVisible ? 'inline' : 'none');
+    }
+
+    function copyLobbyLink(button) {
+        const link = document.getElementById('lobby-link').value;
+        navigator.clipboard.writeText(link).then(() => {
+            const originalIcon = button.innerHTML;
+            button.innerHTML = '<i class="bi bi-check-lg"></i>';
+            setTimeout(() => { button.innerHTML = originalIcon; }, 2000);
+        }, () => {
+            alert('Failed to copy.');
+        });
+    }
+});
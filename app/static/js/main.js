@@ -3,6 +3,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // --- FORM ELEMENTS ---
     const generationForm = document.getElementById('generation-form');
     const templateSelect = document.getElementById('template_select');
+    const templateSearchInput = document.getElementById('template_search');
     const customSettingsDiv = document.getElementById('custom_settings');
     const generateButton = document.getElementById('generate-button');
     const resultsPlaceholder = document.getElementById('results-placeholder');
@@ -18,6 +19,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
     // --- STATE ---
     let generationConfig = {};
+    let generationTemplateId = 'custom';
     let currentResults = [];
 
     // --- EVENT LISTENERS ---
@@ -28,6 +30,13 @@ document.addEventListener('DOMContentLoaded', function() {
         templateSelect.addEventListener('change', toggleCustomSettings);
         toggleCustomSettings();
     }
+    if (templateSearchInput) {
+        let searchTimer = null;
+        templateSearchInput.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(handleTemplateSearch, 150);
+        });
+    }
     if (customSettingsDiv) {
         setupCustomSettingsInteractions();
         customSettingsDiv.addEventListener('click', handleSettingsRerollClick);
@@ -50,16 +59,28 @@ document.addEventListener('DOMContentLoaded', function() {
         toggleLoading(true);
         clearResultsAndErrors();
 
-        const formData = new FormData(generationForm);
+        const payload = {
+            template_id: templateSelect.value,
+            num_players: parseInt(document.getElementById('num_players').value, 10) || 1
+        };
+        if (payload.template_id === 'custom') {
+            payload.config = buildCustomConfig();
+        }
 
         try {
-            const response = await fetch('/generate', { method: 'POST', body: formData });
+            const response = await fetch('/generate', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+                body: JSON.stringify(payload)
+            });
             const data = await response.json();
 
             if (!response.ok) {
                 displayErrors(data.errors || ['An unknown error occurred.']);
+                markFieldErrors(data.field_errors || {});
             } else {
                 generationConfig = data.config;
+                generationTemplateId = data.is_custom ? 'custom' : payload.template_id;
                 currentResults = data.results;
                 renderResults(data.results, data.is_custom);
             }
@@ -71,6 +92,34 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    /**
+     * Replaces the template dropdown options with the first page of search results for the current query,
+     * the same page the index renders for ?q=, and updates the paging links to match.
+     */
+    async function handleTemplateSearch() {
+        const query = templateSearchInput.value.trim();
+        const pageSize = parseInt(templateSearchInput.dataset.pageSize, 10) || 50;
+        try {
+            const response = await fetch(`/api/templates/search?q=${encodeURIComponent(query)}&limit=${pageSize}`);
+            const data = await response.json();
+            if (!response.ok || !data.success || templateSearchInput.value.trim() !== query) return;
+
+            const selectedValue = templateSelect.value;
+            Array.from(templateSelect.options)
+                .filter(option => option.value !== 'custom')
+                .forEach(option => option.remove());
+            data.items.forEach(item => {
+                const option = new Option(item.name, item.id, false, String(item.id) === selectedValue);
+                if (item.description) option.title = item.description;
+                templateSelect.add(option);
+            });
+            updateTemplateListNav(query, data.next_before);
+            toggleCustomSettings();
+        } catch (error) {
+            console.error('Template search failed:', error);
+        }
+    }
+
     /**
      * Renders the generated results into the DOM.
      * @param {Array} resultsData - Array of player results.
@@ -83,6 +132,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     <h2 class="mb-0">Generation Results:</h2>
                     <div>
                         ${isCustom ? '<button id="save-as-template-btn" class="btn btn-success btn-sm me-2"><i class="bi bi-save"></i> Save as Template</button>' : ''}
+                        <button id="open-lobby-btn" class="btn btn-primary btn-sm me-2"><i class="bi bi-people"></i> Open Lobby</button>
                         <button id="toggle-all-descriptions" class="btn btn-info btn-sm me-2"><i class="bi bi-eye-slash"></i> Show Descriptions</button>
                         <button id="copy-all-btn" class="btn btn-secondary btn-sm"><i class="bi bi-clipboard"></i> Copy All</button>
                     </div>
@@ -155,10 +205,45 @@ document.addEventListener('DOMContentLoaded', function() {
         if (button.id === 'toggle-all-descriptions') toggleAllDescriptions(button);
         if (button.id === 'copy-all-btn') copyResultToClipboard('results-area');
         if (button.id === 'save-as-template-btn') saveTemplateModal.show();
+        if (button.id === 'open-lobby-btn') handleOpenLobby(button);
         if (button.classList.contains('reroll-button')) handleReroll(button);
         if (button.classList.contains('reroll-all-button')) handleRerollAll(button);
     }
 
+    /**
+     * Creates a shared lobby holding the results on screen and opens it.
+     * The template or config they were generated from is sent along so the server can check them.
+     * @param {HTMLElement} button - The button that was clicked.
+     */
+    async function handleOpenLobby(button) {
+        const payload = {
+            template_id: generationTemplateId,
+            num_players: currentResults.length || 1,
+            results: currentResults
+        };
+        if (payload.template_id === 'custom') {
+            payload.config = generationConfig;
+        }
+
+        button.disabled = true;
+        try {
+            const response = await fetch('/lobby', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+                body: JSON.stringify(payload)
+            });
+            const data = await response.json();
+            if (!response.ok || !data.success) {
+                throw new Error((data.errors || []).join(' ') || 'Server error.');
+            }
+            window.location.href = data.url;
+        } catch (error) {
+            console.error('Failed to open lobby:', error);
+            alert(`Error: ${error.message}`);
+            button.disabled = false;
+        }
+    }
+
     /**
      * Handles clicks within the custom settings area for reroll buttons.
      * @param {Event} e - The click event.
@@ -245,12 +330,7 @@ document.addEventListener('DOMContentLoaded', function() {
             }
 
             if (data.new_values && data.new_values.length > 0) {
-                const newValuesForAll = data.new_values;
-
-                for (let i = 0; i < currentResults.length; i++) {
-                    updateCategoryUI(i, categoryName, newValuesForAll);
-                    currentResults[i][categoryName] = newValuesForAll;
-                }
+                applySettingsReroll(categoryName, data.rules, data.new_values, true);
             }
         } catch (error) {
             console.error('Reroll all failed:', error);
@@ -293,9 +373,8 @@ document.addEventListener('DOMContentLoaded', function() {
             if (!response.ok || !data.success) {
                 throw new Error(data.error || 'Server error during reroll.');
             }
-            // By default, update player 1
-            updateCategoryUI(0, categoryName, data.new_values);
-            currentResults[0][categoryName] = data.new_values;
+            // By default, update player 1 (every player if the category is shared)
+            applySettingsReroll(categoryName, data.rules, data.new_values, false);
         } catch (error) {
             console.error('Settings reroll single failed:', error);
             alert(`Error: ${error.message}`);
@@ -343,12 +422,7 @@ document.addEventListener('DOMContentLoaded', function() {
             }
 
             if (data.new_values && data.new_values.length > 0) {
-                const newValuesForAll = data.new_values;
-
-                for (let i = 0; i < currentResults.length; i++) {
-                    updateCategoryUI(i, categoryName, newValuesForAll);
-                    currentResults[i][categoryName] = newValuesForAll;
-                }
+                applySettingsReroll(categoryName, data.rules, data.new_values, true);
             }
         } catch (error) {
             console.error('Settings reroll all failed:', error);
@@ -359,6 +433,34 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    /**
+     * Applies a settings-panel reroll to the displayed results. The form's rules may have changed since
+     * generation, so results only change when the category was generated with the same (server-normalized)
+     * rules; otherwise the results would no longer match generationConfig, e.g. when opening a lobby.
+     * @param {string} categoryName - The category that was rerolled.
+     * @param {Object} rules - The normalized rules the server rerolled with.
+     * @param {Array} newValues - The new values.
+     * @param {boolean} forAllPlayers - Update every player instead of player 1.
+     */
+    function applySettingsReroll(categoryName, rules, newValues, forAllPlayers) {
+        const generatedRules = generationConfig[categoryName];
+        const generated = currentResults.some(player => categoryName in player);
+        if (!generatedRules || !generated || !sameRules(generatedRules, rules)) {
+            displayNotice(`The rules for '${categoryName}' changed since this challenge was generated. Generate again to apply them.`);
+            return;
+        }
+        const playerIndexes = (forAllPlayers || generatedRules.apply_all) ? currentResults.keys() : [0];
+        for (const i of playerIndexes) {
+            updateCategoryUI(i, categoryName, newValues);
+            currentResults[i][categoryName] = newValues;
+        }
+    }
+
+    function sameRules(a, b) {
+        const canonical = rules => JSON.stringify(rules, Object.keys(rules).sort());
+        return canonical(a) === canonical(b);
+    }
+
     /**
      * Gets current category rules from the form.
      * @param {string} categoryName - The category name.
@@ -375,9 +477,12 @@ document.addEventListener('DOMContentLoaded', function() {
 
         const rules = {
             rule: ruleSelect.value,
-            count: countInput ? parseInt(countInput.value, 10) || 1 : 1,
             apply_all: applyAllCheckbox ? applyAllCheckbox.checked : true
         };
+        // Sent as typed, so the server reports an empty or non-positive count instead of us guessing.
+        if (countInput && (rules.rule === 'random_from_category' || rules.rule === 'random_from_list')) {
+            rules.count = countInput.value.trim();
+        }
 
         if (rules.rule === 'fixed') {
             const fixedInput = formElement.querySelector(`input[name^="fixed_value_"]:not([style*="display: none"])`) ||
@@ -394,12 +499,25 @@ document.addEventListener('DOMContentLoaded', function() {
             const stepInput = formElement.querySelector(`input[name="range_step_${categoryName}"]`);
             if (minInput) rules.min = minInput.value;
             if (maxInput) rules.max = maxInput.value;
-            if (stepInput) rules.step = stepInput.value;
+            if (stepInput && stepInput.value !== '') rules.step = stepInput.value;
         }
 
         return rules;
     }
 
+    /**
+     * Builds the custom generation config from every included category in the form.
+     * @returns {Object} - Category name to rules mapping, in the shape /generate validates.
+     */
+    function buildCustomConfig() {
+        const config = {};
+        customSettingsDiv.querySelectorAll('input[name="include_category"]:checked').forEach(checkbox => {
+            const rules = getCurrentCategoryRules(checkbox.value);
+            if (rules) config[checkbox.value] = rules;
+        });
+        return config;
+    }
+
     /**
      * Handles saving the current custom config as a new template.
      */
@@ -409,8 +527,6 @@ document.addEventListener('DOMContentLoaded', function() {
         const name = nameInput.value.trim();
         const description = descInput.value.trim();
 
-        window.location.href = "/?template_saved=true&template_name=" + encodeURIComponent(data.new_template.name);
-
         nameInput.classList.remove('is-invalid');
 
         if (!name) {
@@ -433,12 +549,20 @@ document.addEventListener('DOMContentLoaded', function() {
                 throw new Error(data.error);
             }
 
-            const newOption = new Option(data.new_template.name, data.new_template.id, false, true);
-            templateSelect.add(newOption);
+            // An identical config may already be saved under another name; reuse its option.
+            const existingOption = Array.from(templateSelect.options).find(option => option.value === String(data.new_template.id));
+            if (existingOption) {
+                existingOption.selected = true;
+            } else {
+                templateSelect.add(new Option(data.new_template.name, data.new_template.id, false, true));
+            }
             templateSelect.dispatchEvent(new Event('change'));
 
             saveTemplateModal.hide();
             saveTemplateForm.reset();
+            if (data.existing) {
+                displayNotice(data.message || `An identical template is already saved as '${data.new_template.name}'.`);
+            }
         } catch (error) {
             console.error('Failed to save template:', error);
         }
@@ -457,6 +581,56 @@ document.addEventListener('DOMContentLoaded', function() {
         buttonIcon.classList.toggle('d-none', isLoading);
     }
 
+    function updateTemplateListNav(query, nextBefore) {
+        const nav = document.getElementById('template_list_nav');
+        if (!nav) return;
+        const params = new URLSearchParams();
+        if (query) params.set('q', query);
+        nav.querySelector('.template-list-summary').textContent = query
+            ? `Templates matching "${query}", newest first.`
+            : 'Newest templates first.';
+        nav.querySelector('.template-list-first').classList.add('d-none');
+        const nextLink = nav.querySelector('.template-list-next');
+        nextLink.classList.toggle('d-none', nextBefore === null);
+        if (nextBefore !== null) {
+            params.set('before', nextBefore);
+            nextLink.href = `/?${params.toString()}`;
+        }
+        nav.classList.toggle('d-none', !query && nextBefore === null);
+    }
+
+    /**
+     * Highlights the custom-settings inputs named by field_errors paths such as 'Body Type.count'.
+     * @param {Object} fieldErrors - Path to message mapping from validate_config.
+     */
+    function markFieldErrors(fieldErrors) {
+        const inputPrefixes = { count: 'count_', min: 'range_min_', max: 'range_max_', step: 'range_step_' };
+        for (const [path, message] of Object.entries(fieldErrors)) {
+            const separator = path.lastIndexOf('.');
+            const prefix = inputPrefixes[path.slice(separator + 1)];
+            if (separator < 0 || !prefix) continue;
+            const input = customSettingsDiv.querySelector(`[name="${CSS.escape(prefix + path.slice(0, separator))}"]`);
+            if (!input) continue;
+            input.classList.add('is-invalid');
+            input.title = message;
+            input.addEventListener('input', () => input.classList.remove('is-invalid'), { once: true });
+        }
+    }
+
+    function displayNotice(message) {
+        const notice = document.createElement('div');
+        notice.className = 'alert alert-info alert-dismissible fade show';
+        notice.setAttribute('role', 'alert');
+        notice.textContent = message;
+        const closeButton = document.createElement('button');
+        closeButton.type = 'button';
+        closeButton.className = 'btn-close';
+        closeButton.dataset.bsDismiss = 'alert';
+        closeButton.setAttribute('aria-label', 'Close');
+        notice.appendChild(closeButton);
+        resultsPlaceholder.before(notice);
+    }
+
     function displayErrors(errors) {
         let errorHtml = '<div class="alert alert-danger alert-dismissible fade show" role="alert">';
         errorHtml += '<strong>Problems occurred during generation:</strong><ul class="mb-0">';
@@ -0,0 +1,309 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from ..catalog import current_catalog
+from ..models import Template
+
+UINT64_MASK = (1 << 64) - 1
+
+
+class _CategoryPlan:
+    """Sampling plan for one category: the pool of outcomes and how many are drawn per challenge."""
+
+    def __init__(self, name, rule, apply_all, pool, count, size=None):
+        self.name = name
+        self.rule = rule
+        self.apply_all = apply_all
+        self.pool = pool
+        self.size = len(pool) if size is None else size
+        self.count = count
+        self.combinations = math.comb(self.size, self.count)
+
+
+class TemplateAnalyzer:
+    """
+    Estimates how a generation config behaves without running the generator draw by draw.
+    The challenge space is computed exactly from the rules, and a batched NumPy simulation
+    mirrors ChallengeGenerator's sampling to report per-value frequencies and duplicate rates.
+    """
+
+    BATCH_CELLS = 1 << 22
+    MAX_TRACKED_VALUES = 1000
+    MAX_POOL_SIZE = np.iinfo(np.int64).max
+
+    def __init__(self, template_id=None, custom_config=None, seed=None, catalog=None):
+        """
+        Initializes the analyzer.
+        Accepts either a template ID or a custom configuration dictionary, like ChallengeGenerator.
+        """
+        self.config = {}
+        self.errors = []
+        self.catalog = catalog or current_catalog()
+        self.template = None
+        self.rng = np.random.default_rng(seed)
+
+        if template_id and template_id != 'custom':
+            self._load_template(template_id)
+        elif custom_config:
+            if not isinstance(custom_config, dict):
+                self.errors.append("The provided custom configuration is not a dictionary.")
+            else:
+                self.config = custom_config
+
+    def _load_template(self, template_id):
+        """Loads a configuration from a template by its ID."""
+        try:
+            template = Template.query.get(int(template_id))
+            if not template:
+                self.errors.append(f"Template with ID {template_id} not found.")
+                return
+            self.template = template
+            self.config = template.config
+            if not isinstance(self.config, dict):
+                self.errors.append(f"The configuration for template {template_id} is not a dictionary.")
+                self.config = {}
+        except ValueError as e:
+            self.errors.append(f"Error loading template ID {template_id}: Invalid ID. {e}")
+
+    def analyze(self, draws=100000, num_players=1):
+        """
+        Runs the analysis. Returns a JSON-serializable dictionary, or None if the
+        configuration could not be turned into a single sampling plan.
+        """
+        if not self.config and not self.errors:
+            self.errors.append("The configuration for analysis is empty.")
+        if self.errors:
+            return None
+
+        draws = max(1, int(draws))
+        num_players = max(1, int(num_players))
+
+        plans = self._build_plans()
+        if not plans:
+            if not self.errors:
+                self.errors.append("No category in the configuration can be analyzed.")
+            return None
+
+        started = time.perf_counter()
+        value_counts, challenge_keys = self._simulate(plans, draws)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        combinations = math.prod(plan.combinations for plan in plans)
+        per_player_combinations = math.prod(plan.combinations for plan in plans if not plan.apply_all)
+
+        _, key_counts = np.unique(challenge_keys, return_counts=True)
+        key_counts = key_counts.astype(np.float64)
+        simulated_collision = float(np.sum(key_counts * (key_counts - 1)) / (draws * (draws - 1))) if draws > 1 else 0.0
+
+        categories = []
+        for plan, counts in zip(plans, value_counts):
+            expected = plan.count / plan.size
+            values = None
+            if counts is not None:
+                values = [
+                    {'value': str(plan.pool[i]), 'expected': expected, 'observed': float(counts[i]) / draws}
+                    for i in range(plan.size)
+                ]
+            categories.append({
+                'name': plan.name,
+                'rule': plan.rule,
+                'count': plan.count,
+                'apply_all': plan.apply_all,
+                'options': plan.size,
+                'combinations': plan.combinations,
+                'values': values,
+            })
+
+        return {
+            'template': {'id': self.template.id, 'name': self.template.name} if self.template else None,
+            'draws': draws,
+            'num_players': num_players,
+            'combinations': combinations,
+            'combinations_log10': math.log10(combinations),
+            'categories': categories,
+            'duplicates': {
+                'exact_probability': 1 / combinations,
+                'simulated_probability': simulated_collision,
+                'unique_fraction': len(key_counts) / draws,
+                'players_share_challenge_probability': self._shared_challenge_probability(
+                    per_player_combinations, num_players),
+            },
+            'elapsed_ms': round(elapsed_ms, 1),
+            'warnings': list(self.errors),
+        }
+
+    def _build_plans(self):
+        """Turns the config into sampling plans, applying the same clamping and validation as the generator."""
+        plans = []
+        for category_name, rules in self.config.items():
+            if not isinstance(rules, dict):
+                self.errors.append(f"Invalid rules for category '{category_name}'.")
+                continue
+
+            rule_type = rules.get('rule', 'random_from_category')
+            apply_all = bool(rules.get('apply_all', False))
+            try:
+                pool, count, size = self._resolve_pool(category_name, rules, rule_type)
+            except ValueError as e:
+                self.errors.append(f"Category '{category_name}': {e}")
+                continue
+            if pool is None:
+                continue
+            if size > self.MAX_POOL_SIZE:
+                self.errors.append(f"Category '{category_name}': {size:,} possible values are too many to simulate.")
+                continue
+
+            plans.append(_CategoryPlan(category_name, rule_type, apply_all, pool, count, size))
+        return plans
+
+    def _resolve_pool(self, category_name, rules, rule_type):
+        """
+        Returns the (pool, count, size) a category draws from, or (None, 0, 0) if it is skipped.
+        Range sizes are computed arithmetically, since huge ranges do not fit len().
+        """
+        if rule_type == 'range':
+            min_val, max_val, step = rules.get('min'), rules.get('max'), rules.get('step', 1)
+            if min_val is None or max_val is None:
+                raise ValueError("The 'range' rule must have 'min' and 'max' specified.")
+            step_v = int(step) if step else 1
+            if step_v <= 0:
+                raise ValueError("Step must be a positive number.")
+            min_v, max_v = int(min_val), int(max_val)
+            if min_v > max_v:
+                raise ValueError("No available integer values in the range.")
+            return range(min_v, max_v + 1, step_v), 1, (max_v - min_v) // step_v + 1
+
+        if rule_type == 'fixed':
+            if rules.get('value') is None:
+                raise ValueError("The 'fixed' rule must have a 'value' specified.")
+            return [rules['value']], 1, 1
+
+        if rule_type not in ('random_from_category', 'random_from_list'):
+            raise ValueError(f"Unknown rule type '{rule_type}'.")
+
+        category = self.catalog.get(category_name)
+        if not category:
+            self.errors.append(f"Category '{category_name}' not found in the database.")
+            return None, 0, 0
+
+        values = category.values
+        if rule_type == 'random_from_list':
+            allowed_values_core = rules.get('allowed_values')
+            if not isinstance(allowed_values_core, list):
+                raise ValueError("The 'random_from_list' rule must have a list of 'allowed_values' specified.")
+            values = [v for v in values if v.value_core in allowed_values_core]
+
+        pool = [v.value_core for v in values]
+        if not pool:
+            raise ValueError("No available values after applying constraints.")
+
+        count = int(rules.get('count', 1))
+        if count < 1:
+            raise ValueError("Count must be a positive number.")
+        if count > len(pool):
+            self.errors.append(f"Requested {count} for category '{category_name}', but only {len(pool)} "
+                               f"available. Selected {len(pool)}.")
+            count = len(pool)
+        return pool, count, len(pool)
+
+    def _simulate(self, plans, draws):
+        """
+        Draws `draws` challenges in batches. Returns per-plan value counts (None when the pool is
+        too large to track) and one uint64 key per drawn challenge. Keys are the mixed-radix
+        encoding of every category's combination rank, so equal keys mean equal challenges as long
+        as the challenge space fits in 64 bits; beyond that the wrap-around acts as a hash.
+        """
+        value_counts = [
+            np.zeros(plan.size, dtype=np.int64) if plan.size <= self.MAX_TRACKED_VALUES else None
+            for plan in plans
+        ]
+        challenge_keys = np.zeros(draws, dtype=np.uint64)
+        rank_tables = [self._colex_table(plan) for plan in plans]
+
+        widest_pool = max(plan.size if 1 < plan.count < plan.size else 1 for plan in plans)
+        batch_size = max(1024, self.BATCH_CELLS // widest_pool)
+
+        for start in range(0, draws, batch_size):
+            stop = min(start + batch_size, draws)
+            keys = challenge_keys[start:stop]
+            for plan, counts, table in zip(plans, value_counts, rank_tables):
+                ranks = self._draw_ranks(plan, stop - start, counts, table)
+                keys *= np.uint64(plan.combinations & UINT64_MASK)
+                keys += ranks
+
+        return value_counts, challenge_keys
+
+    def _draw_ranks(self, plan, batch, counts, table):
+        """Samples one batch for a category, updates its value counts, and returns combination ranks."""
+        if plan.count == plan.size:
+            if counts is not None:
+                counts += batch
+            return np.zeros(batch, dtype=np.uint64)
+
+        if plan.count == 1:
+            picked = self.rng.integers(0, plan.size, size=batch)
+            if counts is not None:
+                counts += np.bincount(picked, minlength=plan.size)
+            return picked.astype(np.uint64)
+
+        # Sampling without replacement: the indices of the `count` smallest random keys per row.
+        noise = self.rng.random((batch, plan.size), dtype=np.float32)
+        picked = np.sort(np.argpartition(noise, plan.count - 1, axis=1)[:, :plan.count], axis=1)
+        if counts is not None:
+            counts += np.bincount(picked.ravel(), minlength=plan.size)
+        ranks = np.zeros(batch, dtype=np.uint64)
+        for j in range(plan.count):
+            ranks += table[picked[:, j], j]
+        return ranks
+
+    @staticmethod
+    def _colex_table(plan):
+        """Binomial table C(i, j + 1) for ranking sorted combinations in colexicographic order."""
+        if plan.count <= 1 or plan.count == plan.size:
+            return None
+        return np.array(
+            [[math.comb(i, j + 1) & UINT64_MASK for j in range(plan.count)] for i in range(plan.size)],
+            dtype=np.uint64,
+        )
+
+    @staticmethod
+    def _shared_challenge_probability(space, num_players):
+        """Probability that at least two of `num_players` independent draws from `space` outcomes coincide."""
+        if num_players < 2:
+            return 0.0
+        if num_players > space:
+            return 1.0
+        unique = 1.0
+        for i in range(1, num_players):
+            unique *= 1 - i / space
+        return 1 - unique
+
+
+class AnalysisCache:
+    """
+    Small thread-safe LRU cache of analysis results. Keys should include everything the result depends on:
+    the template's config hash, the catalog generation and the analysis parameters.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            stats = self._entries.get(key)
+            if stats is not None:
+                self._entries.move_to_end(key)
+            return stats
+
+    def set(self, key, stats):
+        with self._lock:
+            self._entries[key] = stats
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,153 @@
+class ConfigSchemaError(ValueError):
+    """Raised by a field checker when a value does not match the schema."""
+    pass
+
+
+def _integer_string(minimum=None):
+    """Accepts an integer or a numeric string and normalizes it to a string, as the form does."""
+    def check(value):
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            raise ConfigSchemaError("must be an integer.")
+        try:
+            number = int(value)
+        except ValueError:
+            raise ConfigSchemaError("must be an integer.")
+        if minimum is not None and number < minimum:
+            raise ConfigSchemaError(f"must be at least {minimum}.")
+        return str(number)
+    return check
+
+
+def _count(value):
+    """Accepts a positive integer (or numeric string) and normalizes it to an int."""
+    return int(_integer_string(minimum=1)(value))
+
+
+def _boolean(value):
+    if not isinstance(value, bool):
+        raise ConfigSchemaError("must be true or false.")
+    return value
+
+
+def _non_empty_string(value):
+    if not isinstance(value, str) or not value.strip():
+        raise ConfigSchemaError("must be a non-empty string.")
+    return value
+
+
+def _non_empty_string_list(value):
+    if not isinstance(value, list) or not value:
+        raise ConfigSchemaError("must be a non-empty list of values.")
+    for item in value:
+        if not isinstance(item, str) or not item:
+            raise ConfigSchemaError("must contain only non-empty strings.")
+    return value
+
+
+# Per-rule fields: name -> (required, default, checker, kept in the normalized config).
+# 'count' is accepted for every rule because the front end always sends it, but the
+# generator ignores it for 'fixed' and 'range', so it is dropped there like in the form path.
+_COMMON_FIELDS = {
+    'rule': (True, None, _non_empty_string, True),
+    'apply_all': (False, False, _boolean, True),
+}
+
+CONFIG_SCHEMA = {
+    'random_from_category': {
+        'count': (False, 1, _count, True),
+    },
+    'random_from_list': {
+        'count': (False, 1, _count, True),
+        'allowed_values': (True, None, _non_empty_string_list, True),
+    },
+    'fixed': {
+        'count': (False, None, _count, False),
+        'value': (True, None, _non_empty_string, True),
+    },
+    'range': {
+        'count': (False, None, _count, False),
+        'min': (True, None, _integer_string(), True),
+        'max': (True, None, _integer_string(), True),
+        'step': (False, '1', _integer_string(minimum=1), True),
+    },
+}
+
+
+def _compile_rule(rule_name, fields):
+    """Builds a validator for one rule type from its field table."""
+    fields = {**_COMMON_FIELDS, **fields}
+    checks = tuple((name, required, default, checker, keep) for name, (required, default, checker, keep) in fields.items())
+    allowed = frozenset(fields)
+
+    def validate(rules, field_errors, path):
+        normalized = {}
+        for key in rules:
+            if key not in allowed:
+                field_errors[f"{path}.{key}"] = f"Unknown field '{key}' for the '{rule_name}' rule."
+        for name, required, default, checker, keep in checks:
+            # An empty string counts as missing only for required fields; for optional ones
+            # (e.g. an emptied count box) it goes to the checker and is reported, not defaulted.
+            if name not in rules or rules[name] is None or (required and rules[name] == ''):
+                if required:
+                    field_errors[f"{path}.{name}"] = f"'{name}' is required for the '{rule_name}' rule."
+                elif keep and default is not None:
+                    normalized[name] = default
+                continue
+            try:
+                value = checker(rules[name])
+            except ConfigSchemaError as e:
+                field_errors[f"{path}.{name}"] = f"'{name}' {e}"
+                continue
+            if keep:
+                normalized[name] = value
+        return normalized
+
+    return validate
+
+
+def compile_config_schema(schema):
+    """
+    Compiles a rule schema into a single validator function.
+    The returned function takes a decoded JSON config and returns (normalized_config, errors, field_errors),
+    where field_errors maps 'Category.field' paths to messages. The normalized config has the same shape
+    as the one built from the form, so both submission paths produce identical configs.
+    """
+    rule_validators = {rule_name: _compile_rule(rule_name, fields) for rule_name, fields in schema.items()}
+    rule_names = ", ".join(f"'{name}'" for name in schema)
+
+    def validate(config):
+        if not isinstance(config, dict):
+            return None, ["The configuration must be a JSON object."], {}
+        if not config:
+            return None, ["At least one category must be selected for custom generation."], {}
+
+        normalized, errors, field_errors = {}, [], {}
+        for category_name, rules in config.items():
+            category_errors = {}
+            if not category_name.strip():
+                category_errors[category_name] = "Category name cannot be empty."
+            elif not isinstance(rules, dict):
+                category_errors[category_name] = "Rules must be a JSON object."
+            else:
+                rule = rules.get('rule', 'random_from_category')
+                validator = rule_validators.get(rule) if isinstance(rule, str) else None
+                if validator is None:
+                    category_errors[f"{category_name}.rule"] = f"'rule' must be one of {rule_names}."
+                else:
+                    category_config = validator({'rule': 'random_from_category', **rules}, category_errors, category_name)
+                    if not category_errors and category_config.get('rule') == 'range' \
+                            and int(category_config['min']) > int(category_config['max']):
+                        category_errors[f"{category_name}.min"] = "'min' cannot be greater than 'max'."
+                    if not category_errors:
+                        normalized[category_name] = category_config
+
+            for path, message in category_errors.items():
+                errors.append(f"Error in category '{category_name}': {message}")
+            field_errors.update(category_errors)
+
+        return normalized, errors, field_errors
+
+    return validate
+
+
+validate_config = compile_config_schema(CONFIG_SCHEMA)
@@ -1,7 +1,7 @@
 import random
 import json
-from ..models import Category, Value, Template
-from .. import db
+from ..catalog import CategoryRecord, current_catalog
+from ..models import Template
 
 class ChallengeGeneratorError(Exception):
     """Custom exception for generation errors."""
@@ -10,13 +10,15 @@ class ChallengeGeneratorError(Exception):
 class ChallengeGenerator:
     """Class to generate challenge parameters for one or more players."""
 
-    def __init__(self, template_id=None, custom_config=None):
+    def __init__(self, template_id=None, custom_config=None, catalog=None):
         """
         Initializes the generator.
         Accepts either a template ID or a custom configuration dictionary.
+        Categories come from the given catalog snapshot, or the current one.
         """
         self.config = {}
         self.errors = []
+        self.catalog = catalog or current_catalog()
 
         if template_id and template_id != 'custom':
             self._load_template(template_id)
@@ -77,7 +79,7 @@ class ChallengeGenerator:
                 apply_all = rules.get('apply_all', False)
 
                 try:
-                    category = Category.query.filter_by(name=category_name).first()
+                    category = self.catalog.get(category_name)
                     if not category:
                         if f"Category '{category_name}' not found in the database." not in self.errors:
                             self.errors.append(f"Category '{category_name}' not found in the database.")
@@ -128,7 +130,7 @@ class ChallengeGenerator:
                 fixed_value_core = rules.get('value')
                 if fixed_value_core is None:
                     raise ValueError("The 'fixed' rule must have a 'value' specified.")
-                value_obj = Value.query.filter_by(category_id=category.id, value_core=fixed_value_core).first()
+                value_obj = category.find_value(fixed_value_core)
                 description = value_obj.description if value_obj else None
                 result = [{'value': fixed_value_core, 'description': description}]
             elif rule_type == 'random_from_category':
@@ -214,6 +216,85 @@ class ChallengeGenerator:
         except (TypeError, ValueError) as e:
             raise ValueError(f"Invalid parameters for range (min={min_val}, max={max_val}, step={step}): {e}")
 
+    def validate_results(self, results):
+        """
+        Checks results from an earlier generate() call (e.g. sent back by the browser) against self.config
+        and the catalog: every value must be one the rules could have produced.
+        Returns the results rebuilt from the catalog, so descriptions never come from the client,
+        or None with the problems in self.errors.
+        """
+        if not isinstance(results, list) or not (1 <= len(results) <= 10) \
+                or not all(isinstance(player, dict) for player in results):
+            self.errors.append("Results must be a list of 1 to 10 player objects.")
+            return None
+
+        for category_name in {name for player in results for name in player} - set(self.config):
+            self.errors.append(f"Category '{category_name}' is not part of this configuration.")
+
+        rebuilt = [{} for _ in results]
+        for category_name, rules in self.config.items():
+            category = self.catalog.get(category_name)
+            if not isinstance(rules, dict) or category is None \
+                    or not any(category_name in player for player in results):
+                continue
+
+            player_values = [player.get(category_name) for player in results]
+            if rules.get('apply_all') and any(values != player_values[0] for values in player_values):
+                self.errors.append(f"'{category_name}' must be the same for every player.")
+                continue
+            for i, values in enumerate(player_values):
+                if values is None:
+                    continue
+                checked = self._check_value_set(category, rules, values)
+                if checked is None:
+                    self.errors.append(f"Player {i + 1} has values for '{category_name}' that its rules cannot produce.")
+                    break
+                rebuilt[i][category_name] = checked
+
+        if self.errors:
+            return None
+        if not any(rebuilt):
+            self.errors.append("The results are empty.")
+            return None
+        return rebuilt
+
+    def _check_value_set(self, category, rules, values):
+        """Returns one category's values rebuilt from the catalog, or None if the rules cannot produce them."""
+        if not isinstance(values, list) or not values \
+                or not all(isinstance(item, dict) and isinstance(item.get('value'), str) for item in values):
+            return None
+        cores = [item['value'] for item in values]
+        if len(set(cores)) != len(cores):
+            return None
+
+        rule_type = rules.get('rule', 'random_from_category')
+        if rule_type == 'range':
+            try:
+                number = int(cores[0])
+                min_v, max_v, step_v = int(rules.get('min')), int(rules.get('max')), int(rules.get('step') or 1)
+            except (TypeError, ValueError):
+                return None
+            if len(cores) != 1 or step_v <= 0 or not (min_v <= number <= max_v) or (number - min_v) % step_v:
+                return None
+            return [{'value': cores[0], 'description': None}]
+        if rule_type == 'fixed':
+            if cores != [rules.get('value')]:
+                return None
+            value_obj = category.find_value(cores[0])
+            return [{'value': cores[0], 'description': value_obj.description if value_obj else None}]
+        try:
+            count = int(rules.get('count', 1))
+        except (TypeError, ValueError):
+            return None
+        if rule_type not in ('random_from_category', 'random_from_list') or len(cores) > count:
+            return None
+
+        allowed = rules.get('allowed_values') if rule_type == 'random_from_list' else None
+        value_objs = [category.find_value(core) for core in cores]
+        if any(v is None or (allowed is not None and v.value_core not in allowed) for v in value_objs):
+            return None
+        return [{'value': v.value_core, 'description': v.description} for v in value_objs]
+
     def reroll_category(self, category, rules, num_values=None):
         """
         Generates values for a SINGLE category based on given rules.
@@ -222,7 +303,7 @@ class ChallengeGenerator:
         """
         self.errors = []
 
-        if not isinstance(category, Category):
+        if not isinstance(category, CategoryRecord):
              self.errors.append("Invalid category object for reroll.")
              return None
         if not isinstance(rules, dict):
@@ -0,0 +1,71 @@
+import re
+
+from .. import db
+from ..models import Template
+
+SEARCH_TABLE = 'template_fts'
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _uses_fts():
+    return db.engine.dialect.name == 'sqlite'
+
+
+def build_match_query(text):
+    """
+    Turns free user input into a safe FTS5 MATCH expression for type-ahead.
+    Every word must match, and the last one is treated as a prefix.
+    Returns None when the input contains no searchable words.
+    """
+    tokens = _TOKEN_RE.findall(text or '')
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_templates(text, before=None, limit=20):
+    """
+    Searches templates by name and description, newest first.
+    Uses keyset pagination on the template id: pass the returned `next_before` as `before`
+    to get the next page. Returns (items, next_before) where items are id/name/description dicts.
+    """
+    match = build_match_query(text)
+    params = {'limit': limit + 1, 'before': before, 'match': match}
+
+    if match is None:
+        rows = db.session.execute(db.text(
+            "SELECT id, name, description FROM template "
+            f"{'WHERE id < :before ' if before is not None else ''}"
+            "ORDER BY id DESC LIMIT :limit"
+        ), params).all()
+    elif _uses_fts():
+        rows = db.session.execute(db.text(
+            f"SELECT t.id, t.name, t.description FROM {SEARCH_TABLE} f "
+            "JOIN template t ON t.id = f.rowid "
+            f"WHERE {SEARCH_TABLE} MATCH :match "
+            f"{'AND f.rowid < :before ' if before is not None else ''}"
+            "ORDER BY f.rowid DESC LIMIT :limit"
+        ), params).all()
+    else:
+        query = db.select(Template.id, Template.name, Template.description)
+        for token in _TOKEN_RE.findall(text):
+            pattern = f"%{token}%"
+            query = query.where(db.or_(Template.name.ilike(pattern), Template.description.ilike(pattern)))
+        if before is not None:
+            query = query.where(Template.id < before)
+        rows = db.session.execute(query.order_by(Template.id.desc()).limit(limit + 1)).all()
+
+    items = [{'id': row[0], 'name': row[1], 'description': row[2]} for row in rows[:limit]]
+    next_before = items[-1]['id'] if len(rows) > limit else None
+    return items, next_before
+
+
+def rebuild_search_index():
+    """Rebuilds the FTS index from the template table (e.g. after a bulk import that bypassed the triggers)."""
+    if not _uses_fts():
+        return False
+    db.session.execute(db.text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES('rebuild')"))
+    db.session.commit()
+    return True
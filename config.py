@@ -11,6 +11,25 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'you-will-never-guess'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JSON_AS_ASCII = False
+    # Limits for the public stats endpoint; the analyze-template CLI is not capped.
+    ANALYZER_DEFAULT_DRAWS = 20000
+    ANALYZER_MAX_DRAWS = 100000
+    ANALYZER_CACHE_SIZE = 256
+    TEMPLATES_PER_PAGE = 50
+    TEMPLATE_SEARCH_MAX_LIMIT = 50
+    ASSETS_USE_MANIFEST = False
+    CATALOG_CHECK_INTERVAL = 5
+    LOBBY_STORE = 'memory'
+    LOBBY_TTL = 6 * 3600
+    LOBBY_MAX_COUNT = 10000
+    LOBBY_KEEPALIVE_SECONDS = 15
+    # Open event streams per process; above this, viewers get a 503 and poll /state instead.
+    LOBBY_MAX_STREAMS = int(os.environ.get('LOBBY_MAX_STREAMS', 500))
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN')
+    PROFILING_INTERVAL = 0.001
+    PROFILING_MAX_FILES = 50
+    PROFILE_DIR = os.path.join(datadir, 'profiles')
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -21,6 +40,7 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     """Production configuration."""
     DEBUG = False
+    ASSETS_USE_MANIFEST = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
         'sqlite:///' + os.path.join(datadir, 'challenges_prod.db')
 
@@ -0,0 +1,61 @@
+"""Full-text search index over template name and description
+
+template_fts and its shadow tables (template_fts_data, _idx, _docsize, _config) are
+created with raw SQL and are not in the SQLAlchemy metadata. include_name in
+migrations/env.py skips every template_fts* table, so `flask db migrate` does not
+detect them as removed and generate a migration that drops the search index.
+
+Revision ID: 16fa54f03fdc
+Revises: fd66f1b487a2
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '16fa54f03fdc'
+down_revision = 'fd66f1b487a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases fall back to LIKE queries in template_search.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("""
+        CREATE VIRTUAL TABLE template_fts USING fts5(
+            name, description,
+            content='template', content_rowid='id',
+            prefix='1 2 3', tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER template_fts_ai AFTER INSERT ON template BEGIN
+            INSERT INTO template_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER template_fts_ad AFTER DELETE ON template BEGIN
+            INSERT INTO template_fts(template_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER template_fts_au AFTER UPDATE OF name, description ON template BEGIN
+            INSERT INTO template_fts(template_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO template_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+        END
+    """)
+    op.execute("INSERT INTO template_fts(template_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS template_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS template_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS template_fts_ai")
+    op.execute("DROP TABLE IF EXISTS template_fts")
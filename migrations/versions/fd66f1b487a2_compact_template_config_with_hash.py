@@ -0,0 +1,54 @@
+"""Store template configs as compact JSON with a content hash
+
+Revision ID: fd66f1b487a2
+Revises: 507ac3fc79bd
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fd66f1b487a2'
+down_revision = '507ac3fc79bd'
+branch_labels = None
+depends_on = None
+
+
+template_table = sa.table('template',
+    sa.column('id', sa.Integer),
+    sa.column('config_json', sa.Text),
+    sa.column('config_hash', sa.String),
+)
+
+
+def upgrade():
+    with op.batch_alter_table('template', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('config_hash', sa.String(length=64), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(template_table.c.id, template_table.c.config_json)).fetchall()
+    for template_id, config_json in rows:
+        try:
+            compact = json.dumps(json.loads(config_json), ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        except (TypeError, ValueError):
+            compact = config_json
+        connection.execute(
+            template_table.update()
+            .where(template_table.c.id == template_id)
+            .values(config_json=compact, config_hash=hashlib.sha256(compact.encode('utf-8')).hexdigest())
+        )
+
+    with op.batch_alter_table('template', schema=None) as batch_op:
+        batch_op.alter_column('config_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_index(batch_op.f('ix_template_config_hash'), ['config_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('template', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_template_config_hash'))
+        batch_op.drop_column('config_hash')
@@ -3,6 +3,9 @@ import click
 from flask.cli import with_appcontext
 from flask_migrate import upgrade
 from app import create_app, db
+from app.assets import build_assets
+from app.utils.analyzer import TemplateAnalyzer
+from app.utils.template_search import rebuild_search_index
 from seeding import populate_initial_data as populate_db_function
 
 config_name = os.getenv('FLASK_CONFIG') or 'default'
@@ -22,6 +25,88 @@ def seed_db_command():
         click.echo(click.style(f"Error while seeding data: {e}", fg="red"), err=True)
 
 
+@app.cli.command("analyze-template")
+@click.argument("template_id", type=int)
+@click.option("--draws", default=1000000, show_default=True, help="Number of simulated challenges.")
+@click.option("--players", default=1, show_default=True, help="Number of players per generation.")
+@click.option("--seed", type=int, default=None, help="Seed for a reproducible simulation.")
+@with_appcontext
+def analyze_template_command(template_id, draws, players, seed):
+    """Reports the challenge space and simulated outcome frequencies of a template."""
+    analyzer = TemplateAnalyzer(template_id=template_id, seed=seed)
+    stats = None if analyzer.errors else analyzer.analyze(draws=draws, num_players=players)
+    if stats is None:
+        for error in analyzer.errors:
+            click.echo(click.style(error, fg="red"), err=True)
+        return
+
+    click.echo(f"Template: {stats['template']['name']} (ID {template_id})")
+    click.echo(f"Challenge space: {stats['combinations']:,} combinations (10^{stats['combinations_log10']:.2f})")
+    click.echo(f"Simulated {stats['draws']:,} draws in {stats['elapsed_ms']:.0f} ms")
+
+    for category in stats['categories']:
+        flag = " [all players]" if category['apply_all'] else ""
+        click.echo(click.style(f"\n{category['name']}{flag}", fg="cyan") +
+                   f" - {category['rule']}, {category['count']} of {category['options']}, "
+                   f"{category['combinations']:,} combinations")
+        if category['values'] is None:
+            click.echo("  (too many values to track individually)")
+            continue
+        for item in sorted(category['values'], key=lambda v: v['observed'], reverse=True):
+            click.echo(f"  {item['observed']:8.4%}  (expected {item['expected']:.4%})  {item['value']}")
+
+    duplicates = stats['duplicates']
+    click.echo(click.style("\nDuplicates", fg="cyan"))
+    click.echo(f"  Same challenge twice (exact):     {duplicates['exact_probability']:.6g}")
+    click.echo(f"  Same challenge twice (simulated): {duplicates['simulated_probability']:.6g}")
+    click.echo(f"  Unique challenges in simulation:  {duplicates['unique_fraction']:.4%}")
+    if players > 1:
+        click.echo(f"  Two of {players} players identical:   {duplicates['players_share_challenge_probability']:.6g}")
+    for warning in stats['warnings']:
+        click.echo(click.style(warning, fg="yellow"))
+
+
+@app.cli.command("rebuild-search-index")
+@with_appcontext
+def rebuild_search_index_command():
+    """Rebuilds the full-text template search index."""
+    if rebuild_search_index():
+        click.echo(click.style("Template search index rebuilt.", fg="green"))
+    else:
+        click.echo("The database does not use an FTS index; nothing to rebuild.")
+
+
+@app.cli.command("build-assets")
+def build_assets_command():
+    """Builds fingerprinted, minified and precompressed static assets."""
+    click.echo("Building static assets...")
+    try:
+        manifest = build_assets(app.static_folder, log=click.echo)
+        click.echo(click.style(f"Built {len(manifest)} assets into static/dist.", fg="green"))
+    except Exception as e:
+        # A non-zero exit fails `RUN flask build-assets`, so an image never ships without its manifest.
+        raise click.ClickException(f"Error while building assets: {e}") from e
+
+
+@app.cli.command("reload-catalog")
+@click.option("--force", is_flag=True, help="Publish a new generation even if nothing changed.")
+@with_appcontext
+def reload_catalog_command(force):
+    """Re-seeds the catalog from JSON and signals running workers to reload it."""
+    click.echo("Reloading the catalog from ready_data.json...")
+    try:
+        changes = populate_db_function(force_publish=force)
+    except Exception as e:
+        db.session.rollback()
+        click.echo(click.style(f"Error while reloading the catalog: {e}", fg="red"), err=True)
+        return
+    if changes is None:
+        click.echo(click.style("The catalog was not reloaded.", fg="red"), err=True)
+    else:
+        interval = app.config['CATALOG_CHECK_INTERVAL']
+        click.echo(click.style(f"Catalog reloaded; workers will pick it up within {interval} s.", fg="green"))
+
+
 # Новая, автоматизированная команда
 @app.cli.command("init-app")
 @with_appcontext
@@ -1,6 +1,7 @@
 import os
 import json
 from app import db
+from app.catalog import publish_generation
 from app.models import Category, Value
 from config import datadir
 
@@ -23,10 +24,12 @@ CATEGORY_GROUP_MAP = {
 }
 DEFAULT_GROUP = "Other"
 
-def populate_initial_data():
+def populate_initial_data(force_publish=False):
     """
     Populates or updates the database with category values from the JSON file,
     including the display group for categories.
+    If anything changed (or force_publish is set), publishes a new catalog generation
+    so running workers swap in the new data. Returns the number of changes, or None on error.
     """
     json_path = os.path.join(datadir, "ready_data.json")
 
@@ -49,25 +52,33 @@ def populate_initial_data():
         return
 
     print("Checking and adding categories and values...")
+    changes = 0
     try:
+        categories_by_name = {
+            category.name: category
+            for category in Category.query.options(db.selectinload(Category.values)).all()
+        }
         for category_name, values_list in automation_data.items():
             if not isinstance(values_list, list):
                 print(f"Warning: Expected a list of values for category '{category_name}', skipping.")
                 continue
 
-            category = Category.query.filter_by(name=category_name).first()
+            category = categories_by_name.get(category_name)
             display_group = CATEGORY_GROUP_MAP.get(category_name, DEFAULT_GROUP)
 
             if not category:
                 category = Category(name=category_name, display_group=display_group)
                 db.session.add(category)
                 db.session.flush()
+                changes += 1
                 print(f"  Added new category: {category_name} (Group: {display_group})")
             elif category.display_group != display_group:
                 print(f"  Updated group for category '{category_name}' to '{display_group}'")
                 category.display_group = display_group
+                changes += 1
 
-            existing_value_cores = {val.value_core for val in category.values}
+            existing_values = {val.value_core: val for val in category.values}
+            seen_value_cores = set()
 
             for value_item in values_list:
                 value_str = str(value_item)
@@ -75,14 +86,30 @@ def populate_initial_data():
                 value_core = parts[0].strip()
                 description = parts[1].strip() if len(parts) > 1 else None
 
-                if value_core not in existing_value_cores:
+                if value_core in seen_value_cores:
+                    continue
+                seen_value_cores.add(value_core)
+
+                existing_value = existing_values.get(value_core)
+                if existing_value is None:
                     new_value = Value(value_core=value_core, description=description, category=category)
                     db.session.add(new_value)
-                    existing_value_cores.add(value_core)
+                    existing_values[value_core] = new_value
+                    changes += 1
+                elif existing_value.description != description:
+                    existing_value.description = description
+                    changes += 1
 
         db.session.commit()
         print("Database has been successfully updated/populated with category and group data.")
 
+        if changes or force_publish:
+            generation = publish_generation()
+            print(f"{changes} change(s) applied. Published catalog generation {generation}.")
+        else:
+            print("Catalog is already up to date.")
+        return changes
+
     except Exception as e:
         db.session.rollback()
         print(f"Error while adding/updating data: {e}")
@@ -0,0 +1,93 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from app.catalog import CatalogSnapshot, CategoryRecord, ValueRecord
+from app.utils.analyzer import TemplateAnalyzer, _CategoryPlan
+
+
+def _catalog(**sizes):
+    categories = []
+    next_id = 1
+    for category_id, (name, size) in enumerate(sizes.items(), start=1):
+        values = [ValueRecord(next_id + i, f"{name} {i}", None) for i in range(size)]
+        next_id += size
+        categories.append(CategoryRecord(category_id, name, None, "Other", values))
+    return CatalogSnapshot(1, categories)
+
+
+def _analyzer(config, seed=1234, **sizes):
+    return TemplateAnalyzer(custom_config=config, seed=seed, catalog=_catalog(**sizes))
+
+
+def test_combinations_is_product_of_binomials():
+    analyzer = _analyzer({
+        'Body': {'rule': 'random_from_category', 'count': 3},
+        'Engine': {'rule': 'random_from_category', 'count': 1},
+        'Fuel': {'rule': 'random_from_list', 'count': 2, 'allowed_values': ['Fuel 0', 'Fuel 1', 'Fuel 2', 'Fuel 3']},
+        'Year': {'rule': 'range', 'min': '1', 'max': '20', 'step': '3'},
+        'Trim': {'rule': 'fixed', 'value': 'Trim 0'},
+    }, Body=10, Engine=5, Fuel=6, Trim=2)
+
+    stats = analyzer.analyze(draws=1000)
+
+    assert analyzer.errors == []
+    assert stats['combinations'] == math.comb(10, 3) * 5 * math.comb(4, 2) * 7 * 1
+    assert [c['combinations'] for c in stats['categories']] == [120, 5, 6, 7, 1]
+
+
+@pytest.mark.parametrize('size, count', [(6, 2), (6, 3), (7, 5)])
+def test_colex_ranks_are_a_bijection_onto_range(size, count):
+    plan = _CategoryPlan('Body', 'random_from_category', False, list(range(size)), count)
+    table = TemplateAnalyzer._colex_table(plan)
+
+    ranks = sorted(int(sum(table[i, j] for j, i in enumerate(combo)))
+                   for combo in itertools.combinations(range(size), count))
+
+    assert ranks == list(range(math.comb(size, count)))
+
+
+def test_drawn_ranks_cover_all_combinations():
+    analyzer = _analyzer({}, Body=6)
+    plan = _CategoryPlan('Body', 'random_from_category', False, list(range(6)), 3)
+    counts = np.zeros(plan.size, dtype=np.int64)
+
+    ranks = analyzer._draw_ranks(plan, 20000, counts, TemplateAnalyzer._colex_table(plan))
+
+    assert set(ranks.tolist()) == set(range(math.comb(6, 3)))
+    assert counts.sum() == 20000 * 3
+
+
+def test_mixed_radix_keys_distinguish_every_challenge():
+    analyzer = _analyzer({}, Body=5, Engine=4)
+    plans = [
+        _CategoryPlan('Body', 'random_from_category', False, list(range(5)), 2),
+        _CategoryPlan('Engine', 'random_from_category', False, list(range(4)), 1),
+    ]
+
+    _, keys = analyzer._simulate(plans, 50000)
+
+    assert set(keys.tolist()) == set(range(math.comb(5, 2) * 4))
+
+
+def test_simulated_collision_probability_matches_exact():
+    analyzer = _analyzer({
+        'Body': {'rule': 'random_from_category', 'count': 2},
+        'Engine': {'rule': 'random_from_category', 'count': 1},
+    }, Body=5, Engine=10)
+
+    stats = analyzer.analyze(draws=200000)
+
+    duplicates = stats['duplicates']
+    assert stats['combinations'] == 100
+    assert duplicates['exact_probability'] == pytest.approx(1 / 100)
+    assert duplicates['simulated_probability'] == pytest.approx(1 / 100, rel=0.05)
+
+
+def test_huge_range_is_reported_not_raised():
+    analyzer = _analyzer({'Year': {'rule': 'range', 'min': '1', 'max': '99999999999999999999'}})
+
+    assert analyzer.analyze(draws=100) is None
+    assert analyzer.errors and 'too many to simulate' in analyzer.errors[0]
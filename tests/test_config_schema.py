@@ -0,0 +1,71 @@
+import pytest
+
+from app.utils.config_schema import validate_config
+
+
+def test_valid_config_is_normalized():
+    config, errors, field_errors = validate_config({
+        'Body Type': {'count': '2'},
+        'Engine Layout': {'rule': 'random_from_list', 'allowed_values': ['Front', 'Rear'], 'apply_all': True},
+        'Fuel': {'rule': 'fixed', 'value': 'Petrol', 'count': 1},
+        'Year': {'rule': 'range', 'min': 1950, 'max': '2020', 'step': '10'},
+    })
+
+    assert errors == [] and field_errors == {}
+    assert config == {
+        'Body Type': {'rule': 'random_from_category', 'apply_all': False, 'count': 2},
+        'Engine Layout': {'rule': 'random_from_list', 'apply_all': True, 'count': 1,
+                          'allowed_values': ['Front', 'Rear']},
+        'Fuel': {'rule': 'fixed', 'apply_all': False, 'value': 'Petrol'},
+        'Year': {'rule': 'range', 'apply_all': False, 'min': '1950', 'max': '2020', 'step': '10'},
+    }
+
+
+@pytest.mark.parametrize('config', [None, [], 'Body Type', {}])
+def test_rejects_non_object_or_empty_config(config):
+    normalized, errors, field_errors = validate_config(config)
+
+    assert normalized is None
+    assert len(errors) == 1 and field_errors == {}
+
+
+@pytest.mark.parametrize('rule', [[], {}, 3, None, 'unknown'])
+def test_rejects_invalid_rule(rule):
+    _, errors, field_errors = validate_config({'Body Type': {'rule': rule}})
+
+    assert list(field_errors) == ['Body Type.rule']
+    assert errors == [f"Error in category 'Body Type': {field_errors['Body Type.rule']}"]
+
+
+@pytest.mark.parametrize('rules, path', [
+    ('random', 'Body Type'),
+    ({'count': 0}, 'Body Type.count'),
+    ({'count': ''}, 'Body Type.count'),
+    ({'count': True}, 'Body Type.count'),
+    ({'count': 'two'}, 'Body Type.count'),
+    ({'apply_all': 'yes'}, 'Body Type.apply_all'),
+    ({'rule': 'random_from_list', 'allowed_values': []}, 'Body Type.allowed_values'),
+    ({'rule': 'random_from_list', 'allowed_values': ['Sedan', 1]}, 'Body Type.allowed_values'),
+    ({'rule': 'fixed'}, 'Body Type.value'),
+    ({'rule': 'range', 'min': 1, 'max': 2, 'step': 0}, 'Body Type.step'),
+    ({'colour': 'red'}, 'Body Type.colour'),
+])
+def test_reports_field_errors(rules, path):
+    normalized, errors, field_errors = validate_config({'Body Type': rules, 'Fuel': {}})
+
+    assert path in field_errors
+    assert errors
+    assert 'Body Type' not in normalized and 'Fuel' in normalized
+
+
+def test_range_min_greater_than_max():
+    _, errors, field_errors = validate_config({'Year': {'rule': 'range', 'min': '2000', 'max': '1990'}})
+
+    assert field_errors == {'Year.min': "'min' cannot be greater than 'max'."}
+    assert errors == ["Error in category 'Year': 'min' cannot be greater than 'max'."]
+
+
+def test_empty_required_field_is_reported_as_missing():
+    _, _, field_errors = validate_config({'Fuel': {'rule': 'fixed', 'value': ''}})
+
+    assert field_errors == {'Fuel.value': "'value' is required for the 'fixed' rule."}